@@ -2,21 +2,49 @@
 # Single file with all templates and functionality
 
 import base64
+import gzip
 import hashlib
+import hmac
 import json
 import os
+import re
+import secrets
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
 import uuid
+from collections import OrderedDict
 from datetime import datetime, timedelta, date
+from functools import lru_cache, wraps
 
 import cv2
 import numpy as np
 import pytesseract
-from flask import (Flask, jsonify, redirect, render_template,
-                   render_template_string, request, session, url_for, send_from_directory)
+from flask import (Flask, Request, Response, abort, g, jsonify, redirect, render_template,
+                   request, session, url_for, send_from_directory)
 
+from flask.json.provider import DefaultJSONProvider
 from flask_sqlalchemy import SQLAlchemy
-from werkzeug.utils import secure_filename
-from sqlalchemy import inspect
+from jinja2 import BaseLoader, ChoiceLoader, FileSystemBytecodeCache, FileSystemLoader, TemplateNotFound
+from markupsafe import Markup, escape
+from werkzeug.exceptions import BadRequest, RequestEntityTooLarge, UnsupportedMediaType
+from werkzeug.local import LocalProxy
+from sqlalchemy import Integer, cast, event, func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.orm import joinedload
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Set Tesseract path for Windows
 pytesseract.pytesseract.tesseract_cmd = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
@@ -26,16 +54,122 @@ app = Flask(__name__)
 app.config['SECRET_KEY'] = 'insurance-platform-secret-key-123'
 app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///insurance_platform.db'
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+# Sized for bursts of concurrent page loads; every request checks out one connection
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+    'pool_size': 25,
+    'max_overflow': 25,
+    'pool_pre_ping': True,
+    'pool_recycle': 1800,
+    'connect_args': {'check_same_thread': False},
+}
 app.config['UPLOAD_FOLDER'] = 'uploads'
+# Compiled templates are kept for the life of the process, even under debug=True
+app.config['TEMPLATES_AUTO_RELOAD'] = False
 app.permanent_session_lifetime = timedelta(days=30)
 
+
+# Werkzeug's default spools large uploads to an anonymous temp file that then has to
+# be copied out; spooled into the upload folder instead, the file can be hard-linked
+# into place (see save_upload) so the request writes each upload to disk only once.
+# The decision is per request: once the whole body is over the threshold, every file
+# part in it is spooled to disk, small ones included
+UPLOAD_SPOOL_THRESHOLD = 500 * 1024
+
+# The mode open() gives a new file under the process umask. NamedTemporaryFile creates
+# its file 0600, which a linked upload would otherwise keep
+_process_umask = os.umask(0)
+os.umask(_process_umask)
+UPLOAD_FILE_MODE = 0o666 & ~_process_umask
+
+
+class UploadRequest(Request):
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        if total_content_length is None or total_content_length <= UPLOAD_SPOOL_THRESHOLD:
+            return super()._get_file_stream(total_content_length, content_type, filename, content_length)
+        # Removed when the request closes; a linked copy outlives it
+        spool = tempfile.NamedTemporaryFile('wb+', dir=app.config['UPLOAD_FOLDER'])
+        os.chmod(spool.fileno(), UPLOAD_FILE_MODE)
+        return spool
+
+
+app.request_class = UploadRequest
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    # Serialises in orjson's native code. Dates pass through to Flask's default() so
+    # they keep the same HTTP-date format as before, as do other types orjson lacks
+    def dumps(self, obj, **kwargs):
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        return orjson.dumps(obj, default=self.default, option=option).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        # Takes the raw request bytes; orjson's decode errors subclass ValueError, so
+        # malformed bodies fail the same way as with the stdlib parser
+        return orjson.loads(s)
+
+
+if orjson is not None:
+    app.json = OrjsonProvider(app)
+# Compact, unsorted output even under debug (Flask 3's replacements for the old
+# JSON_SORT_KEYS / JSONIFY_PRETTYPRINT_REGULAR settings)
+app.json.sort_keys = False
+app.json.compact = True
+
+# Page templates live inline in this file and are looked up by name, so Jinja
+# compiles each one once and caches it instead of re-parsing per request
+PAGE_TEMPLATES = {}
+
+
+class InlineTemplateLoader(BaseLoader):
+    # Sources are module constants, so they are minified on load and never go stale
+    def __init__(self, mapping):
+        self.mapping = mapping
+
+    def get_source(self, environment, template):
+        if template not in self.mapping:
+            raise TemplateNotFound(template)
+        return minify_html(self.mapping[template]), None, lambda: True
+
+
+app.jinja_loader = ChoiceLoader([InlineTemplateLoader(PAGE_TEMPLATES), FileSystemLoader('templates')])
+
 # Create necessary folders
-for folder in ['uploads', 'templates', 'static/css', 'static/js', 'static/images', 'biometric_data', 'claim_documents']:
+for folder in ['uploads', 'templates', 'static/css', 'static/js', 'static/images', 'biometric_data', 'claim_documents',
+               'profile_pictures', 'cache/jinja']:
     os.makedirs(folder, exist_ok=True)
 
+# Named templates are compiled once per host: the bytecode is keyed on the template
+# name and checked against a hash of its source, so every worker (and restart) reuses it
+app.jinja_env.bytecode_cache = FileSystemBytecodeCache('cache/jinja', '%s.cache')
+
 # Initialize database
 db = SQLAlchemy(app)
 
+# Flag lazy-load N+1 query patterns during development
+if os.environ.get('FLASK_DEBUG') == '1':
+    try:
+        from nplusone.ext.flask_sqlalchemy import NPlusOne
+        NPlusOne(app)
+    except ImportError:
+        print("!!! WARNING: 'nplusone' not installed. N+1 query detection disabled.")
+
+
+# Tune SQLite for concurrent readers on every new pooled connection
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute('PRAGMA journal_mode=WAL')
+    cursor.execute('PRAGMA synchronous=NORMAL')
+    cursor.execute('PRAGMA cache_size=-64000')
+    cursor.execute('PRAGMA mmap_size=268435456')
+    cursor.execute('PRAGMA temp_store=MEMORY')
+    cursor.close()
+
+
+# Only on this app's engine, and only when it is SQLite
+with app.app_context():
+    if db.engine.dialect.name == 'sqlite':
+        event.listen(db.engine, 'connect', set_sqlite_pragmas)
+
 # Load OpenCV classifiers with error handling
 try:
     eye_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_eye.xml')
@@ -60,25 +194,39 @@ class User(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     digital_token = db.Column(db.String(50), unique=True, nullable=False)
     username = db.Column(db.String(50), unique=True, nullable=False)
-    password_hash = db.Column(db.String(100), nullable=False)
+    password_hash = db.Column(db.LargeBinary(32), nullable=False)  # raw SHA-256 digest
     full_name = db.Column(db.String(100), nullable=False)
     email = db.Column(db.String(100), unique=True, nullable=False)
     phone = db.Column(db.String(15), nullable=False)
     date_of_birth = db.Column(db.Date, nullable=False)
-    age = db.Column(db.Integer, nullable=False)
     gender = db.Column(db.String(10), nullable=False)
     address = db.Column(db.Text, nullable=False)
     pan_number = db.Column(db.String(20), unique=True, nullable=False)
-    face_data = db.Column(db.Text)
-    fingerprint_data = db.Column(db.Text)
-    retina_data = db.Column(db.Text)
+    # Biometric status markers; no view reads them, so they are only loaded on access
+    face_data = db.deferred(db.Column(db.String(255)))
+    fingerprint_data = db.deferred(db.Column(db.String(255)))
+    retina_data = db.deferred(db.Column(db.String(255)))
     profile_picture = db.Column(db.String(255), nullable=True)  # ADD THIS LINE
     account_status = db.Column(db.String(20), default='active')
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     last_login = db.Column(db.DateTime)
+    # Denormalised row counts, maintained by the Policy/Claim insert and delete hooks
+    policies_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    claims_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
     policies = db.relationship('Policy', backref='user', lazy=True)
     claims = db.relationship('Claim', backref='user', lazy=True)
 
+    # Derived from date_of_birth so it never goes stale
+    @hybrid_property
+    def age(self):
+        return calculate_age(self.date_of_birth)
+
+    @age.expression
+    def age(cls):
+        years = (cast(func.strftime('%Y', 'now'), Integer)
+                 - cast(func.strftime('%Y', cls.date_of_birth), Integer))
+        return years - cast(func.strftime('%m-%d', 'now') < func.strftime('%m-%d', cls.date_of_birth), Integer)
+
 
 class Scheme(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -89,22 +237,25 @@ class Scheme(db.Model):
     coverage_amount = db.Column(db.Float, nullable=False)
     min_age = db.Column(db.Integer, default=18)
     max_age = db.Column(db.Integer, default=65)
-    features = db.Column(db.Text)
+    features = db.Column(db.JSON)
     is_active = db.Column(db.Boolean, default=True)
 
 
 class Policy(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     policy_number = db.Column(db.String(20), unique=True, nullable=False)
-    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
-    scheme_id = db.Column(db.Integer, db.ForeignKey('scheme.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
+    scheme_id = db.Column(db.Integer, db.ForeignKey('scheme.id'), nullable=False, index=True)
     start_date = db.Column(db.Date, nullable=True, default=date.today)
     end_date = db.Column(db.Date, nullable=True)
     premium_amount = db.Column(db.Float, nullable=False)
     coverage_amount = db.Column(db.Float, nullable=False)
     status = db.Column(db.String(20), default='applied')
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    scheme = db.relationship('Scheme', backref='policies')
+    scheme = db.relationship('Scheme', backref='policies', lazy='joined')
+    nominees = db.relationship('Nominee', backref='policy', lazy=True)
+
+    __table_args__ = (db.Index('ix_policy_user_status', 'user_id', 'status'),)
 
     @property
     def is_withdrawable(self):
@@ -113,8 +264,8 @@ class Policy(db.Model):
 
 class Nominee(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
-    policy_id = db.Column(db.Integer, db.ForeignKey('policy.id'), nullable=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
+    policy_id = db.Column(db.Integer, db.ForeignKey('policy.id'), nullable=True, index=True)
     name = db.Column(db.String(100), nullable=False)
     relationship = db.Column(db.String(50), nullable=False)
 
@@ -122,45 +273,123 @@ class Nominee(db.Model):
 class Claim(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     claim_number = db.Column(db.String(20), unique=True, nullable=False)
-    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
-    policy_id = db.Column(db.Integer, db.ForeignKey('policy.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
+    policy_id = db.Column(db.Integer, db.ForeignKey('policy.id'), nullable=False, index=True)
     claim_amount = db.Column(db.Float, nullable=False)
     document_paths = db.Column(db.Text)
     status = db.Column(db.String(20), default='submitted')
     submitted_at = db.Column(db.DateTime, default=datetime.utcnow)
-    policy = db.relationship('Policy', backref='claims')
+    policy = db.relationship('Policy', backref='claims', lazy='joined')
 
 
 class Report(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
     report_type = db.Column(db.String(50), nullable=False)
     description = db.Column(db.Text, nullable=False)
     status = db.Column(db.String(20), default='submitted')
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
 
+def user_counter_hook(column, delta):
+    # Bumps user.<column> inside the flush that inserts/deletes the row
+    users = User.__table__
+
+    def hook(mapper, connection, target):
+        connection.execute(users.update().where(users.c.id == target.user_id)
+                           .values({column: users.c[column] + delta}))
+    return hook
+
+
+for _model, _column in ((Policy, 'policies_count'), (Claim, 'claims_count')):
+    event.listen(_model, 'after_insert', user_counter_hook(_column, 1))
+    event.listen(_model, 'after_delete', user_counter_hook(_column, -1))
+
+
 # ===================================
 # HELPER FUNCTIONS
 # ===================================
 def generate_token():
-    return str(uuid.uuid4())[:8].upper()
+    return secrets.token_hex(4).upper()
 
 
 def generate_policy_number():
-    return f"POL{datetime.now().strftime('%Y%m%d%H%M')}{str(uuid.uuid4())[:6].upper()}"
+    return f"POL{datetime.now().strftime('%Y%m%d%H%M')}{secrets.token_hex(3).upper()}"
 
 
 def generate_claim_number():
-    return f"CLM{datetime.now().strftime('%Y%m%d%H%M')}{str(uuid.uuid4())[:6].upper()}"
+    return f"CLM{datetime.now().strftime('%Y%m%d%H%M')}{secrets.token_hex(3).upper()}"
 
 
 def hash_password(password):
-    return hashlib.sha256(password.encode('utf-8')).hexdigest()
+    return hashlib.sha256(password.encode('utf-8')).digest()
+
+
+# Cache of password check results, keyed on a digest of (password, stored hash)
+# so raw passwords are never held in memory
+PASSWORD_CACHE_SIZE = 4096
+_password_cache = OrderedDict()
+_password_cache_lock = threading.Lock()
 
 
 def verify_password(password, password_hash):
-    return hashlib.sha256(password.encode('utf-8')).hexdigest() == password_hash
+    password_bytes = password.encode('utf-8')
+    key = hashlib.blake2b(password_bytes + password_hash, digest_size=16).digest()
+    with _password_cache_lock:
+        if key in _password_cache:
+            _password_cache.move_to_end(key)
+            return _password_cache[key]
+
+    result = hmac.compare_digest(hashlib.sha256(password_bytes).digest(), password_hash)
+
+    with _password_cache_lock:
+        _password_cache[key] = result
+        if len(_password_cache) > PASSWORD_CACHE_SIZE:
+            _password_cache.popitem(last=False)
+    return result
+
+
+def digital_token_matches(stored, token):
+    # Constant-time, so response timing doesn't reveal how much of a guess was right
+    return stored is not None and hmac.compare_digest(stored.encode('utf-8'), token.encode('utf-8'))
+
+
+def verify_digital_token(user_id, token):
+    # Primary-key lookup of the one column, for views that haven't loaded the user
+    stored = db.session.execute(db.select(User.digital_token).where(User.id == user_id)).scalar()
+    return digital_token_matches(stored, token)
+
+
+# Checked against when the username doesn't exist, so unknown and known users
+# take the same path through verify_password
+DUMMY_PASSWORD_HASH = hash_password(secrets.token_hex(16))
+
+# Recent failed logins per (client address, username), checked before the user
+# lookup so repeated guessing is turned away without DB or hashing work
+LOGIN_FAILURE_LIMIT = 5
+LOGIN_FAILURE_WINDOW = 60
+LOGIN_FAILURE_KEYS = 10000
+_login_failures = OrderedDict()
+_login_failures_lock = threading.Lock()
+
+
+def login_throttled(key):
+    cutoff = time.monotonic() - LOGIN_FAILURE_WINDOW
+    with _login_failures_lock:
+        failures = [t for t in _login_failures.get(key, ()) if t > cutoff]
+        if failures:
+            _login_failures[key] = failures
+        else:
+            _login_failures.pop(key, None)
+        return len(failures) >= LOGIN_FAILURE_LIMIT
+
+
+def record_login_failure(key):
+    with _login_failures_lock:
+        _login_failures.setdefault(key, []).append(time.monotonic())
+        _login_failures.move_to_end(key)
+        if len(_login_failures) > LOGIN_FAILURE_KEYS:
+            _login_failures.popitem(last=False)
 
 
 def calculate_age(dob):
@@ -168,307 +397,398 @@ def calculate_age(dob):
     return today.year - dob.year - ((today.month, today.day) < (dob.month, dob.day))
 
 
+PAN_PATTERN = re.compile(r'[A-Z]{5}[0-9]{4}[A-Z]')
+
+
 def validate_pan(pan):
-    import re
-    return bool(re.match(r'^[A-Z]{5}[0-9]{4}[A-Z]{1}$', pan.upper()))
+    return PAN_PATTERN.fullmatch(pan.upper()) is not None
 
 
-def get_image_from_data_url(data_url):
-    image_bytes = base64.b64decode(data_url.split(',')[1])
+# Uploads are copied in 1 MB chunks rather than FileStorage.save()'s 16 KB default,
+# so a large claim document takes a handful of read/write calls instead of hundreds
+UPLOAD_COPY_BUFFER = 1 << 20
+
+
+# Uploads are stored under random names; only a short alphanumeric extension is kept
+# from the client's filename, so nothing it sends can shape the path
+UPLOAD_EXTENSION_PATTERN = re.compile(r'\.[a-z0-9]{1,7}')
+
+
+def upload_filename(client_filename):
+    extension = os.path.splitext(client_filename)[1].lower()
+    if not UPLOAD_EXTENSION_PATTERN.fullmatch(extension):
+        extension = ''
+    return uuid.uuid4().hex + extension
+
+
+def save_upload(file, path):
+    spooled = getattr(file.stream, 'name', None)
+    if isinstance(spooled, str):
+        try:
+            file.stream.flush()
+            os.link(spooled, path)
+            return
+        except OSError:
+            # Different filesystem, or links unsupported: fall back to copying
+            file.stream.seek(0)
+    with open(path, 'wb', buffering=0) as dst:
+        shutil.copyfileobj(file.stream, dst, UPLOAD_COPY_BUFFER)
+
+
+def get_image_bytes_from_data_url(data_url):
+    return base64.b64decode(data_url.split(',')[1])
+
+
+def decode_image(image_bytes, flags=cv2.IMREAD_COLOR):
     nparr = np.frombuffer(image_bytes, np.uint8)
-    return cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+    return cv2.imdecode(nparr, flags)
+
+
+def get_image_from_data_url(data_url):
+    return decode_image(get_image_bytes_from_data_url(data_url))
+
+
+# Cascade detection cost grows with pixel count; phone selfies are downscaled first
+# into a per-thread scratch buffer that is reused across requests
+DETECTION_MAX_SIDE = 640
+_detection_buffers = threading.local()
+
+
+def _detection_scratch():
+    if not hasattr(_detection_buffers, 'gray'):
+        _detection_buffers.gray = np.empty((DETECTION_MAX_SIDE, DETECTION_MAX_SIDE), np.uint8)
+    return _detection_buffers.gray
+
+
+def _detect_eyes(image_bytes):
+    gray = decode_image(image_bytes, cv2.IMREAD_GRAYSCALE)
+    h, w = gray.shape
+    scale = DETECTION_MAX_SIDE / max(h, w)
+    if scale < 1:
+        new_w = min(DETECTION_MAX_SIDE, max(1, round(w * scale)))
+        new_h = min(DETECTION_MAX_SIDE, max(1, round(h * scale)))
+        gray = cv2.resize(gray, (new_w, new_h), dst=_detection_scratch()[:new_h, :new_w],
+                          interpolation=cv2.INTER_AREA)
+    eyes = eye_cascade.detectMultiScale(gray, 1.1, 4, minSize=(30, 30))
+    return len(eyes) >= 2
 
 
 def validate_eye_clarity(data):
     if not eye_cascade: return True
     try:
-        img = get_image_from_data_url(data)
-        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-        eyes = eye_cascade.detectMultiScale(gray, 1.1, 4)
-        return len(eyes) >= 2
+        return _detect_eyes(get_image_bytes_from_data_url(data))
     except:
         return False
 
 
-@app.template_filter('from_json')
-def from_json_filter(v):
-    try:
-        return json.loads(v) if v else []
-    except:
-        return []
+MIGRATION_INDEXES = [
+    ('ix_policy_user_id', 'policy', 'user_id'),
+    ('ix_policy_scheme_id', 'policy', 'scheme_id'),
+    ('ix_policy_user_status', 'policy', 'user_id, status'),
+    ('ix_nominee_user_id', 'nominee', 'user_id'),
+    ('ix_nominee_policy_id', 'nominee', 'policy_id'),
+    ('ix_claim_user_id', 'claim', 'user_id'),
+    ('ix_claim_policy_id', 'claim', 'policy_id'),
+    ('ix_report_user_id', 'report', 'user_id'),
+]
 
 
-def migrate_database():
-    """Migrate existing database to add missing columns"""
-    try:
-        from sqlalchemy import inspect
-        inspector = inspect(db.engine)
+def get_table_columns(conn, table):
+    return {row[1] for row in conn.execute(db.text(f'PRAGMA table_info({table})'))}
+
+
+def drop_user_age_column(conn):
+    # DROP COLUMN needs SQLite 3.35+; older versions get SQLite's documented rebuild:
+    # copy into a table built from the model, drop the old one, rename the copy
+    if sqlite3.sqlite_version_info >= (3, 35, 0):
+        conn.execute(db.text('ALTER TABLE user DROP COLUMN age'))
+        return
+    existing = get_table_columns(conn, 'user')
+    columns = ', '.join(column.name for column in User.__table__.columns if column.name in existing)
+    User.__table__.to_metadata(db.MetaData(), name='user_rebuild').create(conn)
+    conn.execute(db.text(f'INSERT INTO user_rebuild ({columns}) SELECT {columns} FROM user'))
+    conn.execute(db.text('DROP TABLE user'))
+    conn.execute(db.text('ALTER TABLE user_rebuild RENAME TO user'))
+
 
+def migrate_database():
+    """Migrate existing database to add missing columns. Run once at startup, after create_all()."""
+    with db.engine.connect() as conn:
         # Check claim table
-        claim_columns = [col['name'] for col in inspector.get_columns('claim')]
+        claim_columns = get_table_columns(conn, 'claim')
         if 'document_paths' not in claim_columns:
             print("Adding missing document_paths column to claim table...")
-            with db.engine.connect() as conn:
-                conn.execute(db.text('ALTER TABLE claim ADD COLUMN document_paths TEXT'))
-                conn.commit()
+            conn.execute(db.text('ALTER TABLE claim ADD COLUMN document_paths TEXT'))
             print("✅ Added document_paths column successfully")
 
         # Check user table
-        user_columns = [col['name'] for col in inspector.get_columns('user')]
+        user_columns = get_table_columns(conn, 'user')
         if 'last_login' not in user_columns:
             print("Adding missing last_login column to user table...")
-            with db.engine.connect() as conn:
-                conn.execute(db.text('ALTER TABLE user ADD COLUMN last_login DATETIME'))
-                conn.commit()
+            conn.execute(db.text('ALTER TABLE user ADD COLUMN last_login DATETIME'))
             print("✅ Added last_login column successfully")
 
         if 'profile_picture' not in user_columns:
             print("Adding missing profile_picture column to user table...")
-            with db.engine.connect() as conn:
-                conn.execute(db.text('ALTER TABLE user ADD COLUMN profile_picture VARCHAR(255)'))
-                conn.commit()
+            conn.execute(db.text('ALTER TABLE user ADD COLUMN profile_picture VARCHAR(255)'))
             print("✅ Added profile_picture column successfully")
 
-    except Exception as e:
-        print(f"Migration error: {e}")
-        print("🔄 Recreating database with correct schema...")
-        db.drop_all()
-        db.create_all()
-        print("✅ Database recreated successfully")
+        for counter, table in (('policies_count', 'policy'), ('claims_count', 'claim')):
+            if counter not in user_columns:
+                print(f"Adding {counter} column to user table...")
+                conn.execute(db.text(f'ALTER TABLE user ADD COLUMN {counter} INTEGER NOT NULL DEFAULT 0'))
+                conn.execute(db.text(f'UPDATE user SET {counter} = '
+                                     f'(SELECT COUNT(*) FROM {table} WHERE {table}.user_id = user.id)'))
+                print(f"✅ Added and backfilled {counter} column successfully")
+
+        # Last, so the pre-3.35 rebuild copies columns that are already added and backfilled
+        if 'age' in user_columns:
+            print("Dropping stored age column from user table...")
+            drop_user_age_column(conn)
+            print("✅ Dropped age column successfully")
+
+        # Convert hex-encoded password hashes to raw digests
+        legacy_hashes = conn.execute(db.text(
+            "SELECT id, password_hash FROM user WHERE typeof(password_hash) = 'text'")).fetchall()
+        if legacy_hashes:
+            print(f"Converting {len(legacy_hashes)} password hashes to binary digests...")
+            for user_id, hex_hash in legacy_hashes:
+                conn.execute(db.text('UPDATE user SET password_hash = :digest WHERE id = :id'),
+                             {'digest': bytes.fromhex(hex_hash), 'id': user_id})
+            print("✅ Converted password hashes successfully")
+
+        # Ensure foreign-key lookup indexes exist on older databases
+        for name, table, columns in MIGRATION_INDEXES:
+            conn.execute(db.text(f'CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns})'))
+        conn.commit()
+
+
+def get_current_user():
+    # Loaded at most once per request and shared by views and templates
+    if 'user_id' not in session:
+        return None
+    if '_current_user' not in g:
+        g._current_user = User.query.get(session['user_id'])
+    return g._current_user
+
+
+# Active schemes change rarely; cache them as plain dicts (safe to share across
+# sessions) and clear the cache whenever schemes are written
+SCHEME_CACHE_TTL = 300
+_scheme_cache = {'schemes': None, 'by_id': {}, 'panels': {}, 'expires': 0.0}
+
+
+def scheme_to_dict(scheme):
+    return {column.name: getattr(scheme, column.name) for column in Scheme.__table__.columns}
+
+
+def get_active_schemes():
+    now = time.monotonic()
+    if _scheme_cache['schemes'] is None or now >= _scheme_cache['expires']:
+        schemes = [scheme_to_dict(s) for s in Scheme.query.filter_by(is_active=True).all()]
+        _scheme_cache['schemes'] = schemes
+        _scheme_cache['by_id'] = {scheme['id']: scheme for scheme in schemes}
+        _scheme_cache['panels'] = {}
+        _scheme_cache['expires'] = now + SCHEME_CACHE_TTL
+    return _scheme_cache['schemes']
+
+
+def get_active_scheme(scheme_id):
+    # None for unknown or inactive schemes
+    get_active_schemes()
+    return _scheme_cache['by_id'].get(scheme_id)
+
+
+def scheme_plan_panel(scheme):
+    # Rendered plan-details fragment, kept until the scheme cache next reloads
+    panels = _scheme_cache['panels']
+    if scheme['id'] not in panels:
+        panels[scheme['id']] = Markup(render_template('plan_panel.html', scheme=scheme))
+    return panels[scheme['id']]
+
+
+def clear_scheme_cache():
+    _scheme_cache['schemes'] = None
+
+
+# Account status is re-read from the database at most this often per user, so a
+# suspended or closed account loses access within the window, not at session expiry
+ACCOUNT_STATUS_TTL = 30
+_account_status_cache = {}
+
+
+def get_account_status(user_id):
+    now = time.monotonic()
+    cached = _account_status_cache.get(user_id)
+    if cached is None or now >= cached[1]:
+        # None for a deleted user
+        status = db.session.execute(db.select(User.account_status).where(User.id == user_id)).scalar()
+        cached = _account_status_cache[user_id] = (status, now + ACCOUNT_STATUS_TTL)
+    return cached[0]
+
+
+def login_required(view):
+    @wraps(view)
+    def wrapped(*args, **kwargs):
+        if 'user_id' not in session:
+            return redirect('/login')
+        if get_account_status(session['user_id']) != 'active':
+            session.clear()
+            return redirect('/login')
+        return view(*args, **kwargs)
+    return wrapped
+
+
+# Templates that never reference current_user never load it
+current_user = LocalProxy(get_current_user)
+
 
 @app.context_processor
 def inject_user_and_now():
-    user = None
-    if 'user_id' in session:
-        user = User.query.get(session['user_id'])
-    return {'now': datetime.utcnow(), 'current_user': user}
+    return {'now': datetime.utcnow(), 'current_user': current_user}
 
 
 # ===================================
-# MAIN ROUTES
+# RESPONSE HELPERS
 # ===================================
-@app.route('/')
-def home():
-    return render_template_string('''<!DOCTYPE html>
-<html lang="en">
-<head>
-    <title>SecureBank Insurance</title>
-    <style>
-        :root {
-            --primary-purple: #8B4A9C;
-            --secondary-purple: #B366CC;
-            --dark-blue: #2C3E50;
-            --accent-pink: #E91E63;
-            --text-light: #ffffff;
-            --bg-overlay: rgba(0,0,0,0.1);
-        }
+HTML_COMMENT_PATTERN = re.compile(r'<!--(?!\[if).*?-->', re.S)
+STYLE_BLOCK_PATTERN = re.compile(r'(<style[^>]*>)(.*?)(</style>)', re.S)
+SCRIPT_BLOCK_PATTERN = re.compile(r'(<script[^>]*>)(.*?)(</script>)', re.S)
+CSS_COMMENT_PATTERN = re.compile(r'/\*.*?\*/', re.S)
 
-        * { margin: 0; padding: 0; box-sizing: border-box; }
 
-        body {
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            background: linear-gradient(135deg, var(--primary-purple) 0%, var(--dark-blue) 100%);
-            color: var(--text-light);
-            min-height: 100vh;
-            display: flex;
-        }
+def minify_html(html):
+    # Conservative: line structure is kept so inline JS needs no parsing
+    html = HTML_COMMENT_PATTERN.sub('', html)
+    html = STYLE_BLOCK_PATTERN.sub(lambda m: m.group(1) + CSS_COMMENT_PATTERN.sub('', m.group(2)) + m.group(3), html)
+    html = SCRIPT_BLOCK_PATTERN.sub(
+        lambda m: m.group(1) + '\n'.join(line for line in m.group(2).split('\n')
+                                         if not line.strip().startswith('//')) + m.group(3), html)
+    return '\n'.join(line.strip() for line in html.split('\n') if line.strip())
 
-        .sidebar {
-            width: 100px;
-            background: var(--bg-overlay);
-            display: flex;
-            flex-direction: column;
-            align-items: center;
-            padding: 40px 0;
-            backdrop-filter: blur(10px);
-        }
 
-        .sidebar-item {
-            display: flex;
-            flex-direction: column;
-            align-items: center;
-            text-decoration: none;
-            color: var(--text-light);
-            margin-bottom: 40px;
-            transition: transform 0.3s ease;
-        }
+@app.template_global()
+@lru_cache(maxsize=None)
+def asset_url(filename):
+    # Static asset URL fingerprinted with its content hash, so it can be cached forever
+    with open(os.path.join(app.static_folder, filename), 'rb') as f:
+        version = hashlib.blake2b(f.read(), digest_size=4).hexdigest()
+    return f'{app.static_url_path}/{filename}?v={version}'
 
-        .sidebar-item:hover { transform: translateY(-5px); }
-
-        .sidebar-icon {
-            font-size: 28px;
-            margin-bottom: 8px;
-            background: rgba(255,255,255,0.15);
-            width: 60px;
-            height: 60px;
-            border-radius: 15px;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            backdrop-filter: blur(10px);
-        }
 
-        .sidebar-text {
-            font-size: 12px;
-            font-weight: 500;
-            text-transform: uppercase;
-            letter-spacing: 1px;
-        }
+@app.after_request
+def cache_static_assets(response):
+    if request.path.startswith(app.static_url_path + '/') and 'v' in request.args and response.status_code == 200:
+        response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+    return response
 
-        .main-container {
-            flex: 1;
-            display: flex;
-            flex-direction: column;
-        }
 
-        .header {
-            padding: 30px 60px;
-            display: flex;
-            justify-content: flex-end;
-            align-items: center;
-        }
+def render_static_html(html, **context):
+    # One-off Jinja render (asset URLs and other import-time values), then minify
+    return minify_html(app.jinja_env.from_string(html).render(**context))
 
-        .btn {
-            display: inline-block;
-            padding: 15px 35px;
-            margin-left: 20px;
-            border: 2px solid var(--text-light);
-            color: var(--text-light);
-            border-radius: 30px;
-            text-decoration: none;
-            font-weight: 600;
-            font-size: 16px;
-            transition: all 0.3s ease;
-            text-transform: uppercase;
-            letter-spacing: 1px;
-        }
 
-        .btn:hover {
-            transform: translateY(-3px);
-            box-shadow: 0 10px 25px rgba(0,0,0,0.2);
-        }
+def build_static_page(html, **context):
+    # Render, minify, encode and compress a fixed page once; variants are keyed by Content-Encoding
+    body = render_static_html(html, **context).encode('utf-8')
+    variants = {None: body, 'gzip': gzip.compress(body, compresslevel=9)}
+    if brotli is not None:
+        variants['br'] = brotli.compress(body, quality=11)
+    # Each encoding is its own representation, so each gets its own strong ETag
+    return {encoding: (data, hashlib.blake2b(data, digest_size=8).hexdigest())
+            for encoding, data in variants.items()}
 
-        .btn.primary {
-            background: var(--text-light);
-            color: var(--primary-purple);
-        }
 
-        .btn.primary:hover {
-            background: var(--accent-pink);
-            color: var(--text-light);
-            border-color: var(--accent-pink);
-        }
+def negotiate_encoding(available):
+    for encoding in ('br', 'gzip'):
+        if encoding in available and request.accept_encodings.quality(encoding) > 0:
+            return encoding
+    return None
 
-        .hero {
-            flex: 1;
-            display: flex;
-            align-items: center;
-            padding: 0 60px;
-            gap: 80px;
-        }
 
-        .hero-content {
-            flex: 1;
-        }
+def html_response(body, encoding):
+    response = Response(body, mimetype='text/html')
+    response.vary.add('Accept-Encoding')
+    if encoding:
+        response.content_encoding = encoding
+    return response
 
-        .hero-content h1 {
-            font-size: 4.5em;
-            font-weight: 300;
-            line-height: 1.1;
-            margin-bottom: 30px;
-        }
 
-        .hero-content h1 strong {
-            font-weight: 700;
-            background: linear-gradient(45deg, var(--text-light), var(--secondary-purple));
-            -webkit-background-clip: text;
-            -webkit-text-fill-color: transparent;
-        }
+def static_page_response(page):
+    encoding = negotiate_encoding(page)
+    body, etag = page[encoding]
+    response = html_response(body, encoding)
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'public, max-age=300, must-revalidate'
+    # Answers If-None-Match with an empty 304
+    return response.make_conditional(request)
 
-        .hero-content p {
-            font-size: 1.3em;
-            opacity: 0.9;
-            max-width: 500px;
-            line-height: 1.6;
-        }
 
-        /* MODIFICATION: Styles for the slideshow container and its contents */
-        .hero-image {
-            flex: 1;
-            display: flex;
-            justify-content: center;
-            position: relative; /* Needed for positioning arrows */
-        }
+def fixed_page_response(page):
+    # A prebuilt page sent as the outcome of a form POST, so no caching headers
+    encoding = negotiate_encoding(page)
+    return html_response(page[encoding][0], encoding)
 
-        .slideshow-container {
-            width: 100%;
-            max-width: 600px; /* Limit the max width of the slideshow */
-            position: relative;
-            border-radius: 20px;
-            overflow: hidden; /* This is crucial for the zoom effect */
-            box-shadow: 0 30px 60px rgba(0,0,0,0.3);
-        }
 
-        .slide {
-            display: none; /* Hide all slides by default */
-            width: 100%;
-            vertical-align: middle; /* Fixes small gap under image */
-            transition: transform 0.4s ease; /* Smooth zoom transition */
-        }
+# Confirmation pages differ only by their timestamp reference ID, so they are
+# rendered once and split around it; a submission just joins the two halves
+REFERENCE_SLOT = '\x00'
 
-        .slide:hover {
-            transform: scale(1.1); /* Increases size by 10% on hover */
-            cursor: pointer;
-        }
 
-        /* Fade animation */
-        .fade {
-            animation-name: fade;
-            animation-duration: 1.5s;
-        }
+def build_reference_page(html):
+    return tuple(render_static_html(html, reference=REFERENCE_SLOT).split(REFERENCE_SLOT))
 
-        @keyframes fade {
-            from { opacity: .4 }
-            to { opacity: 1 }
-        }
 
-        /* Previous & Next buttons */
-        .prev, .next {
-            cursor: pointer;
-            position: absolute;
-            top: 50%;
-            width: auto;
-            margin-top: -22px;
-            padding: 16px;
-            color: white;
-            font-weight: bold;
-            font-size: 20px;
-            transition: 0.6s ease;
-            border-radius: 0 3px 3px 0;
-            user-select: none;
-            background-color: rgba(0,0,0,0.3);
-        }
-        .next { right: 0; border-radius: 3px 0 0 3px; }
-        .prev { left: 0; }
-        .prev:hover, .next:hover { background-color: rgba(0,0,0,0.8); }
-
-        .footer {
-            text-align: center;
-            padding: 40px 20px;
-            letter-spacing: 8px;
-            color: rgba(255,255,255,0.6);
-            font-weight: 300;
-            font-size: 14px;
-            border-top: 1px solid rgba(255,255,255,0.1);
-        }
+def reference_page_response(page):
+    head, tail = page
+    return Response(head + datetime.utcnow().strftime('%Y%m%d%H%M') + tail, mimetype='text/html')
 
-        @media (max-width: 768px) {
-            .hero { flex-direction: column; text-align: center; gap: 40px; }
-            .hero-content h1 { font-size: 3em; }
-            .header { padding: 20px 30px; }
-            .btn { padding: 12px 25px; font-size: 14px; }
-        }
-    </style>
+
+def compress_body(body):
+    # Per-request compression for dynamic pages, at cheaper levels than the static pages
+    encoding = negotiate_encoding(('br', 'gzip') if brotli is not None else ('gzip',))
+    if encoding == 'br':
+        body = brotli.compress(body, quality=4)
+    elif encoding == 'gzip':
+        body = gzip.compress(body, compresslevel=6)
+    return body, encoding
+
+
+def compressed_html_response(html):
+    return html_response(*compress_body(html.encode('utf-8')))
+
+
+# Smaller pages aren't worth a compression pass (or the Content-Encoding header)
+COMPRESS_MIN_SIZE = 1024
+
+
+@app.after_request
+def compress_html(response):
+    # Catches rendered pages that didn't go through one of the helpers above
+    if (response.status_code != 200 or response.mimetype != 'text/html' or response.content_encoding
+            or response.is_streamed or response.direct_passthrough):
+        return response
+    body = response.get_data()
+    if len(body) < COMPRESS_MIN_SIZE:
+        return response
+    body, encoding = compress_body(body)
+    response.vary.add('Accept-Encoding')
+    if encoding:
+        response.set_data(body)
+        response.content_encoding = encoding
+    return response
+
+
+# ===================================
+# MAIN ROUTES
+# ===================================
+HOME_FIRST_SLIDE = 'https://media.istockphoto.com/id/1241917206/photo/our-baby-our-happiness.jpg?s=612x612&w=0&k=20&c=_NoJdc8ZKcw819kFkBZ6qlEyTbxGZ2MSxD-W06zwF6Q='
+HOME_HTML = '''<!DOCTYPE html>
+<html lang="en">
+<head>
+    <title>SecureBank Insurance</title>
+    <link rel="stylesheet" href="{{ asset_url('css/home.css') }}">
+    <link rel="preload" as="image" href="{{ first_slide }}" fetchpriority="high">
 </head>
 <body>
     <div class="sidebar">
@@ -492,13 +812,9 @@ def home():
             <div class="hero-image">
                 <div class="slideshow-container">
                     <!-- Your three images -->
-                    <div class="slide fade"><img src="https://media.istockphoto.com/id/1241917206/photo/our-baby-our-happiness.jpg?s=612x612&w=0&k=20&c=_NoJdc8ZKcw819kFkBZ6qlEyTbxGZ2MSxD-W06zwF6Q=" style="width:100%"></div>
-                    <div class="slide fade"><img src="https://thumbs.dreamstime.com/b/happy-family-two-children-running-dog-together-happy-family-two-children-running-dog-together-autumn-119764842.jpg" style="width:100%"></div>
-                    <div class="slide fade"><img src="https://thumbs.dreamstime.com/b/portrait-cute-little-kids-happy-children-having-fun-outdoors-playing-summer-park-boy-two-girls-laying-green-fresh-73751469.jpg" style="width:100%"></div>
-
-                    <!-- Next and previous buttons -->
-                    <a class="prev" onclick="plusSlides(-1)">❮</a>
-                    <a class="next" onclick="plusSlides(1)">❯</a>
+                    <div class="slide"><img src="{{ first_slide }}" width="600" height="400" decoding="async" fetchpriority="high" alt="Family"></div>
+                    <div class="slide"><img src="https://thumbs.dreamstime.com/b/happy-family-two-children-running-dog-together-happy-family-two-children-running-dog-together-autumn-119764842.jpg" width="600" height="400" loading="lazy" decoding="async" fetchpriority="low" alt="Family"></div>
+                    <div class="slide"><img src="https://thumbs.dreamstime.com/b/portrait-cute-little-kids-happy-children-having-fun-outdoors-playing-summer-park-boy-two-girls-laying-green-fresh-73751469.jpg" width="600" height="400" loading="lazy" decoding="async" fetchpriority="low" alt="Family"></div>
                 </div>
             </div>
         </div>
@@ -507,192 +823,29 @@ def home():
             <span>B A N K E R   T O   E V E R Y   I N D I A N</span>
         </div>
     </div>
-
-    <!-- MODIFICATION: Enhanced JavaScript for manual and automatic slideshow -->
-    <script>
-        let slideIndex = 1;
-        let slideInterval;
-
-        // Function to display slides
-        function showSlides(n) {
-            let i;
-            let slides = document.getElementsByClassName("slide");
-            if (n > slides.length) { slideIndex = 1 }
-            if (n < 1) { slideIndex = slides.length }
-            for (i = 0; i < slides.length; i++) {
-                slides[i].style.display = "none";
-            }
-            slides[slideIndex - 1].style.display = "block";
-        }
-
-        // Function for next/previous controls
-        function plusSlides(n) {
-            clearInterval(slideInterval); // Stop auto-play
-            showSlides(slideIndex += n);
-            startSlideshow(); // Restart auto-play
-        }
-
-        // Function to start the automatic slideshow
-        function startSlideshow() {
-            slideInterval = setInterval(function() {
-                plusSlides(1);
-            }, 5000); // Change image every 5 seconds
-        }
-
-        // Initialize the slideshow
-        document.addEventListener('DOMContentLoaded', function() {
-            showSlides(slideIndex);
-            startSlideshow();
-        });
-    </script>
 </body>
-</html>''')
+</html>'''
+HOME_PAGE = build_static_page(HOME_HTML, first_slide=HOME_FIRST_SLIDE)
+# Lets the stylesheet and the LCP slide start downloading before the HTML is parsed
+HOME_LINK_HEADER = ', '.join([
+    f"<{asset_url('css/home.css')}>; rel=preload; as=style",
+    f'<{HOME_FIRST_SLIDE}>; rel=preload; as=image; fetchpriority=high',
+    '<https://thumbs.dreamstime.com>; rel=preconnect',
+])
 
 
-@app.route('/login', methods=['GET', 'POST'])
-def login():
-    if request.method == 'POST':
-        try:
-            # Handle both JSON and form data
-            if request.is_json:
-                data = request.get_json()
-            else:
-                data = {
-                    'username': request.form.get('username'),
-                    'password': request.form.get('password')
-                }
-
-            if not data:
-                return jsonify({'success': False, 'message': 'No data received'}), 400
-
-            username = data.get('username', '').strip()
-            password = data.get('password', '')
-
-            if not username or not password:
-                return jsonify({'success': False, 'message': 'Username and password are required'}), 400
-
-            # Find user by username
-            user = User.query.filter_by(username=username).first()
-
-            if user and verify_password(password, user.password_hash):
-                # Successful login
-                session['user_id'] = user.id
-                session.permanent = True
-                user.last_login = datetime.utcnow()
-                db.session.commit()
-                return jsonify({'success': True, 'redirect': '/dashboard'})
-            else:
-                return jsonify({'success': False, 'message': 'Invalid username or password'}), 401
+@app.route('/')
+def home():
+    response = static_page_response(HOME_PAGE)
+    response.headers['Link'] = HOME_LINK_HEADER
+    return response
 
-        except Exception as e:
-            print(f"Login error: {str(e)}")
-            return jsonify({'success': False, 'message': 'Login failed. Please try again.'}), 500
 
-    # GET request - return login form
-    return render_template_string('''<!DOCTYPE html>
+LOGIN_HTML = '''<!DOCTYPE html>
 <html lang="en">
 <head>
     <title>Login - SecureBank Insurance</title>
-    <style>
-        body {
-            font-family: 'Segoe UI', sans-serif;
-            background: linear-gradient(135deg, #8B4A9C 0%, #2C3E50 100%);
-            display: grid;
-            place-items: center;
-            min-height: 100vh;
-            margin: 0;
-        }
-
-        .login-container {
-            background: white;
-            padding: 50px;
-            border-radius: 20px;
-            width: 90%;
-            max-width: 450px;
-            box-shadow: 0 30px 60px rgba(0,0,0,0.3);
-        }
-
-        h2 {
-            color: #2C3E50;
-            text-align: center;
-            margin-bottom: 30px;
-            font-size: 2em;
-        }
-
-        .form-group {
-            margin-bottom: 20px;
-        }
-
-        input {
-            width: 100%;
-            padding: 15px;
-            border: 2px solid #e1e5e9;
-            border-radius: 10px;
-            font-size: 16px;
-            box-sizing: border-box;
-            transition: border-color 0.3s ease;
-        }
-
-        input:focus {
-            outline: none;
-            border-color: #8B4A9C;
-        }
-
-        .btn {
-            width: 100%;
-            padding: 15px;
-            background: linear-gradient(45deg, #8B4A9C, #B366CC);
-            color: white;
-            border: none;
-            border-radius: 10px;
-            font-size: 18px;
-            font-weight: 600;
-            cursor: pointer;
-            transition: transform 0.3s ease;
-        }
-
-        .btn:hover {
-            transform: translateY(-2px);
-        }
-
-        .btn:disabled {
-            opacity: 0.6;
-            cursor: not-allowed;
-            transform: none;
-        }
-
-        .alert-error {
-            background: #f8d7da;
-            color: #721c24;
-            padding: 15px;
-            margin-bottom: 20px;
-            border-radius: 10px;
-            display: none;
-            text-align: center;
-        }
-
-        .links {
-            text-align: center;
-            margin-top: 25px;
-        }
-
-        .links a {
-            color: #8B4A9C;
-            text-decoration: none;
-            font-weight: 600;
-        }
-
-        .links a:hover {
-            text-decoration: underline;
-        }
-
-        .loading {
-            display: none;
-            text-align: center;
-            margin-top: 10px;
-            color: #8B4A9C;
-        }
-    </style>
+    <link rel="stylesheet" href="{{ asset_url('css/login.css') }}">
 </head>
 <body>
     <div class="login-container">
@@ -779,285 +932,75 @@ def login():
         });
     </script>
 </body>
-</html>''')
-
-
-@app.route('/dashboard')
-def dashboard():
-    if 'user_id' not in session:
-        return redirect('/login')
-
-    user = User.query.get(session['user_id'])
-    if not user:
-        session.clear()
-        return redirect('/login')
+</html>'''
+LOGIN_PAGE = build_static_page(LOGIN_HTML)
 
-    policies_count = Policy.query.filter_by(user_id=user.id).count()
-    claims_count = Claim.query.filter_by(user_id=user.id).count()
-
-    return render_template_string('''<!DOCTYPE html>
-<html lang="en">
-<head>
-    <title>Dashboard - SecureBank Insurance</title>
-    <style>
-        :root {
-            --primary-purple: #8B4A9C;
-            --secondary-purple: #B366CC;
-            --dark-blue: #2C3E50;
-            --light-gray: #f8f9fa;
-            --text-dark: #343a40;
-            --text-light: #6c757d;
-        }
-
-        body {
-            font-family: 'Segoe UI', sans-serif;
-            background: var(--light-gray);
-            margin: 0;
-            padding: 0;
-        }
 
-        .container {
-            max-width: 1400px;
-            margin: 0 auto;
-            padding: 30px;
-        }
-
-        .header {
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            background: white;
-            padding: 25px 40px;
-            border-radius: 15px;
-            box-shadow: 0 5px 15px rgba(0,0,0,0.08);
-            margin-bottom: 30px;
-        }
-
-        .welcome-section h1 {
-            color: var(--dark-blue);
-            font-size: 2.2em;
-            margin: 0;
-        }
-
-        .user-info {
-            color: var(--text-light);
-            font-size: 0.95em;
-            margin-top: 5px;
-        }
-
-        .logout-btn {
-            background: linear-gradient(45deg, var(--primary-purple), var(--secondary-purple));
-            color: white;
-            padding: 12px 25px;
-            border: none;
-            border-radius: 25px;
-            text-decoration: none;
-            font-weight: 600;
-            transition: transform 0.3s ease;
-        }
-
-        .logout-btn:hover {
-            transform: translateY(-2px);
-        }
-
-        .stats-grid {
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-            gap: 20px;
-            margin-bottom: 40px;
-        }
-
-        .stat-card {
-            background: white;
-            padding: 25px;
-            border-radius: 15px;
-            text-align: center;
-            box-shadow: 0 5px 15px rgba(0,0,0,0.08);
-        }
-
-        .stat-number {
-            font-size: 2.5em;
-            font-weight: bold;
-            color: var(--primary-purple);
-            margin: 10px 0;
-        }
-
-        .stat-label {
-            color: var(--text-light);
-            font-weight: 500;
-        }
-
-        .main-actions {
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(280px, 1fr));
-            gap: 25px;
-            margin-bottom: 50px;
-        }
-
-        .action-card {
-            background: white;
-            padding: 35px;
-            border-radius: 20px;
-            text-decoration: none;
-            color: var(--text-dark);
-            box-shadow: 0 8px 25px rgba(0,0,0,0.1);
-            display: flex;
-            flex-direction: column;
-            align-items: center;
-            text-align: center;
-            transition: all 0.3s ease;
-            position: relative;
-            overflow: hidden;
-        }
+@app.route('/login', methods=['GET', 'POST'])
+def login():
+    if request.method == 'POST':
+        try:
+            # Handle both JSON and form data
+            if request.is_json:
+                data = request.get_json(cache=True)
+            else:
+                data = {
+                    'username': request.form.get('username'),
+                    'password': request.form.get('password')
+                }
 
-        .action-card::before {
-            content: '';
-            position: absolute;
-            top: 0;
-            left: 0;
-            right: 0;
-            height: 4px;
-            background: linear-gradient(45deg, var(--primary-purple), var(--secondary-purple));
-        }
+            if not data:
+                return jsonify({'success': False, 'message': 'No data received'}), 400
 
-        .action-card:hover {
-            transform: translateY(-8px);
-            box-shadow: 0 15px 40px rgba(0,0,0,0.15);
-        }
+            username = data.get('username', '').strip()
+            password = data.get('password', '')
 
-        .action-icon {
-            font-size: 3.5em;
-            background: linear-gradient(45deg, var(--primary-purple), var(--secondary-purple));
-            -webkit-background-clip: text;
-            -webkit-text-fill-color: transparent;
-            margin-bottom: 20px;
-        }
+            if not username or not password:
+                return jsonify({'success': False, 'message': 'Username and password are required'}), 400
 
-        .action-card h3 {
-            margin: 0 0 15px 0;
-            color: var(--dark-blue);
-            font-size: 1.4em;
-        }
+            throttle_key = (request.remote_addr, username.lower())
+            if login_throttled(throttle_key):
+                return jsonify({'success': False, 'message': 'Too many failed attempts. Please try again later.'}), 429
 
-        .action-card p {
-            color: var(--text-light);
-            line-height: 1.5;
-            margin: 0;
-        }
+            # Find user by username
+            user = User.query.filter_by(username=username).first()
+            password_hash = user.password_hash if user else DUMMY_PASSWORD_HASH
 
-        .assistance-section {
-            margin: 50px 0;
-        }
+            if verify_password(password, password_hash) and user:
+                # Successful login
+                session['user_id'] = user.id
+                session.permanent = True
+                # Rapid re-logins skip the write; last_login only moves once a minute
+                now = datetime.utcnow()
+                if user.last_login is None or now - user.last_login > timedelta(seconds=60):
+                    user.last_login = now
+                    db.session.commit()
+                return jsonify({'success': True, 'redirect': '/dashboard'})
+            else:
+                record_login_failure(throttle_key)
+                return jsonify({'success': False, 'message': 'Invalid username or password'}), 401
 
-        .section-header {
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            margin-bottom: 30px;
-        }
+        except Exception as e:
+            print(f"Login error: {str(e)}")
+            return jsonify({'success': False, 'message': 'Login failed. Please try again.'}), 500
 
-        .section-header h2 {
-            color: var(--dark-blue);
-            font-size: 2em;
-            margin: 0;
-        }
+    # GET request - return login form
+    return static_page_response(LOGIN_PAGE)
 
-        .assistance-grid {
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(300px, 1fr));
-            gap: 25px;
-            margin-bottom: 40px;
-        }
 
-        .assistance-card {
-            background: white;
-            padding: 30px;
-            border-radius: 15px;
-            text-decoration: none;
-            color: var(--text-dark);
-            box-shadow: 0 5px 15px rgba(0,0,0,0.08);
-            transition: all 0.3s ease;
-        }
-
-        .assistance-card:hover {
-            transform: translateY(-5px);
-            box-shadow: 0 10px 30px rgba(0,0,0,0.15);
-        }
-        
-        .assistance-icon {
-            font-size: 2.5em;
-            margin-bottom: 15px;
-            display: block;
-        }
-        
-        .faq-section {
-            background: white;
-            border-radius: 20px;
-            padding: 40px;
-            box-shadow: 0 5px 15px rgba(0,0,0,0.08);
-        }
-        
-        .faq-item {
-            margin-bottom: 15px;
-        }
-        
-        .faq-item details {
-            background: var(--light-gray);
-            padding: 20px;
-            border-radius: 12px;
-            cursor: pointer;
-            transition: all 0.3s ease;
-        }
-        
-        .faq-item details:hover {
-            background: #e9ecef;
-        }
-        
-        .faq-item summary {
-            font-weight: 600;
-            color: var(--primary-purple);
-            font-size: 1.1em;
-            outline: none;
-        }
-        
-        .faq-item details[open] {
-            background: #e3f2fd;
-        }
-        
-        .faq-item details p {
-            margin-top: 15px;
-            color: var(--text-dark);
-            line-height: 1.6;
-        }
-        
-        @media (max-width: 768px) {
-            .container {
-                padding: 20px;
-            }
-            
-            .header {
-                flex-direction: column;
-                gap: 20px;
-                text-align: center;
-            }
-            
-            .main-actions {
-                grid-template-columns: 1fr;
-            }
-            
-            .stats-grid {
-                grid-template-columns: repeat(2, 1fr);
-            }
-        }
-    </style>
+DASHBOARD_HTML = '''<!DOCTYPE html>
+<html lang="en">
+<head>
+    <title>Dashboard - SecureBank Insurance</title>
+    <link rel="stylesheet" href="{{ asset_url('css/dashboard.css') }}">
 </head>
 <body>
     <div class="container">
         <div class="header">
             <div class="welcome-section">
-                <h1>Welcome, {{ user.full_name }}!</h1>
+                <h1>Welcome, {full_name}!</h1>
                 <div class="user-info">
-                    Digital Token: {{ user.digital_token }} | Last Login: {{ user.last_login.strftime('%d %B %Y, %I:%M %p') if user.last_login else 'First time login' }}
+                    Digital Token: {digital_token} | Last Login: {last_login}
                 </div>
             </div>
             <a href="/logout" class="logout-btn">Logout</a>
@@ -1065,15 +1008,15 @@ def dashboard():
         
         <div class="stats-grid">
             <div class="stat-card">
-                <div class="stat-number">{{ policies_count }}</div>
+                <div class="stat-number">{policies_count}</div>
                 <div class="stat-label">Active Policies</div>
             </div>
             <div class="stat-card">
-                <div class="stat-number">{{ claims_count }}</div>
+                <div class="stat-number">{claims_count}</div>
                 <div class="stat-label">Total Claims</div>
             </div>
             <div class="stat-card">
-                <div class="stat-number">{{ user.age }}</div>
+                <div class="stat-number">{age}</div>
                 <div class="stat-label">Age</div>
             </div>
             <div class="stat-card">
@@ -1179,263 +1122,60 @@ def dashboard():
         </div>
     </div>
 </body>
-</html>''', user=user, policies_count=policies_count, claims_count=claims_count)
+</html>'''
 
+# Everything but the user's fields is fixed, so the page is rendered once into a
+# str.format shell and filled per user without going through Jinja
+DASHBOARD_SHELL = render_static_html(DASHBOARD_HTML)
+DASHBOARD_VERSION = hashlib.blake2b(DASHBOARD_SHELL.encode(), digest_size=4).hexdigest()
 
-@app.route('/logout')
-def logout():
-    session.clear()
-    return redirect('/')
-
-
-@app.route('/register', methods=['GET', 'POST'])
-def register():
-    if request.method == 'POST':
-        try:
-            data = request.get_json()
-
-            # Validate required fields
-            required_fields = ['username', 'password', 'full_name', 'email', 'phone',
-                             'date_of_birth', 'gender', 'address', 'pan_number']
-
-            for field in required_fields:
-                if not data.get(field):
-                    return jsonify({'success': False, 'message': f'Missing required field: {field}'}), 400
-
-            # Check if username already exists
-            existing_user = User.query.filter_by(username=data['username']).first()
-            if existing_user:
-                return jsonify({'success': False, 'message': 'Username already exists. Please choose a different username.'}), 400
-
-            # Check if email already exists
-            existing_email = User.query.filter_by(email=data['email']).first()
-            if existing_email:
-                return jsonify({'success': False, 'message': 'Email already registered. Please use a different email.'}), 400
 
-            # Check if PAN already exists
-            existing_pan = User.query.filter_by(pan_number=data['pan_number'].upper()).first()
-            if existing_pan:
-                return jsonify({'success': False, 'message': 'PAN number already registered. Please check your PAN number.'}), 400
+def render_dashboard(full_name, digital_token, last_login, age, policies_count, claims_count):
+    # Filled per request: one format_map over the cached shell, and no per-user pages held
+    return DASHBOARD_SHELL.format_map({
+        'full_name': escape(full_name),
+        'digital_token': escape(digital_token),
+        'last_login': last_login.strftime('%d %B %Y, %I:%M %p') if last_login else 'First time login',
+        'age': age,
+        'policies_count': policies_count,
+        'claims_count': claims_count,
+    })
 
-            # Validate PAN format
-            if not validate_pan(data['pan_number']):
-                return jsonify({'success': False, 'message': 'Invalid PAN number format. Please enter a valid PAN number.'}), 400
 
-            # Parse and validate date of birth
-            try:
-                birth_date = datetime.strptime(data['date_of_birth'], '%Y-%m-%d').date()
-            except ValueError:
-                return jsonify({'success': False, 'message': 'Invalid date format. Please enter a valid date of birth.'}), 400
-
-            # Calculate age and validate
-            calculated_age = calculate_age(birth_date)
-            if calculated_age < 18:
-                return jsonify({'success': False, 'message': 'You must be at least 18 years old to register.'}), 400
-            if calculated_age > 100:
-                return jsonify({'success': False, 'message': 'Please enter a valid date of birth.'}), 400
+@app.route('/dashboard')
+@login_required
+def dashboard():
+    user = get_current_user()
+    if not user:
+        session.clear()
+        return redirect('/login')
 
-            # Create new user
-            user = User(
-                digital_token=generate_token(),
-                username=data['username'].strip(),
-                password_hash=hash_password(data['password']),
-                full_name=data['full_name'].strip(),
-                email=data['email'].strip().lower(),
-                phone=data['phone'].strip(),
-                date_of_birth=birth_date,
-                age=calculated_age,
-                gender=data['gender'].lower(),
-                address=data['address'].strip(),
-                pan_number=data['pan_number'].upper().strip()
-            )
+    state = (user.id, user.full_name, user.digital_token, user.last_login, user.age,
+             user.policies_count, user.claims_count)
 
-            # Add user to database
-            db.session.add(user)
-            db.session.flush()  # This assigns an ID to the user
+    # Weak ETag over the same state, so a revisit with nothing new skips rendering and transfer
+    etag = hashlib.blake2b(repr((DASHBOARD_VERSION,) + state).encode(), digest_size=8).hexdigest()
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+        response.vary.add('Accept-Encoding')
+    else:
+        response = compressed_html_response(render_dashboard(*state[1:]))
+    response.set_etag(etag, weak=True)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
 
-            # Set biometric data as verified (simulated)
-            user.face_data = "verified"
-            user.retina_data = "verified"
 
-            # Commit the transaction
-            db.session.commit()
+@app.route('/logout')
+def logout():
+    session.clear()
+    return redirect('/')
 
-            return jsonify({
-                'success': True,
-                'digital_token': user.digital_token,
-                'message': 'Registration successful! Please save your digital token securely.'
-            })
 
-        except Exception as e:
-            # Rollback in case of any error
-            db.session.rollback()
-            print(f"Registration error: {str(e)}")  # For debugging
-            return jsonify({
-                'success': False,
-                'message': f'Registration failed: {str(e)}'
-            }), 500
-
-    # GET request - return registration form
-    return render_template_string('''<!DOCTYPE html>
+REGISTER_HTML = '''<!DOCTYPE html>
 <html lang="en">
 <head>
     <title>Register - SecureBank Insurance</title>
-    <style>
-        :root {
-            --primary-purple: #8B4A9C;
-            --secondary-purple: #B366CC;
-            --dark-blue: #2C3E50;
-            --light-gray: #f8f9fa;
-        }
-        
-        body {
-            font-family: 'Segoe UI', sans-serif;
-            background-color: var(--light-gray);
-            padding: 20px;
-            margin: 0;
-        }
-        
-        .register-container {
-            background: white;
-            border-radius: 20px;
-            padding: 50px;
-            max-width: 1000px;
-            margin: 0 auto;
-            box-shadow: 0 20px 40px rgba(0,0,0,0.1);
-        }
-        
-        h2 {
-            color: var(--dark-blue);
-            margin-bottom: 30px;
-            text-align: center;
-            font-size: 2.5em;
-        }
-        
-        .form-sections {
-            display: grid;
-            grid-template-columns: 1fr 1fr;
-            gap: 40px;
-            margin-bottom: 30px;
-        }
-        
-        .form-group {
-            margin-bottom: 20px;
-        }
-        
-        input, select, textarea {
-            width: 100%;
-            padding: 15px;
-            border: 2px solid #e1e5e9;
-            border-radius: 10px;
-            font-size: 16px;
-            box-sizing: border-box;
-            transition: border-color 0.3s ease;
-        }
-        
-        input:focus, select:focus, textarea:focus {
-            outline: none;
-            border-color: var(--primary-purple);
-        }
-        
-        .btn-group {
-            display: flex;
-            gap: 20px;
-            margin-top: 30px;
-        }
-        
-        .btn {
-            flex: 1;
-            padding: 18px;
-            border: none;
-            border-radius: 12px;
-            font-size: 18px;
-            font-weight: 600;
-            cursor: pointer;
-            text-decoration: none;
-            text-align: center;
-            transition: all 0.3s ease;
-        }
-        
-        .btn.primary {
-            background: linear-gradient(45deg, var(--primary-purple), var(--secondary-purple));
-            color: white;
-        }
-        
-        .btn.secondary {
-            background: #6c757d;
-            color: white;
-        }
-        
-        .btn.tertiary {
-            background: var(--light-gray);
-            color: #6c757d;
-            border: 2px solid #6c757d;
-        }
-        
-        .btn:hover {
-            transform: translateY(-3px);
-            box-shadow: 0 10px 25px rgba(0,0,0,0.15);
-        }
-        
-        .alert-error {
-            padding: 15px;
-            margin: 20px 0;
-            border-radius: 10px;
-            display: none;
-            text-align: center;
-            background: #f8d7da;
-            color: #721c24;
-        }
-        
-        .biometric-section {
-            text-align: center;
-            padding: 40px 20px;
-        }
-        
-        .camera-container {
-            margin: 30px 0;
-            text-align: center;
-        }
-        
-        video {
-            width: 100%;
-            max-width: 400px;
-            border-radius: 15px;
-            box-shadow: 0 10px 30px rgba(0,0,0,0.2);
-        }
-        
-        .status-message {
-            margin: 20px 0;
-            padding: 15px;
-            border-radius: 10px;
-            font-weight: 600;
-        }
-        
-        .status-success {
-            background: #d4edda;
-            color: #155724;
-        }
-        
-        .status-error {
-            background: #f8d7da;
-            color: #721c24;
-        }
-        
-        .token-display {
-            background: linear-gradient(45deg, var(--primary-purple), var(--secondary-purple));
-            color: white;
-            padding: 40px;
-            border-radius: 20px;
-            text-align: center;
-        }
-        
-        .token-value {
-            font-size: 2em;
-            font-weight: bold;
-            margin: 20px 0;
-            letter-spacing: 3px;
-        }
-    </style>
+    <link rel="stylesheet" href="{{ asset_url('css/register.css') }}">
 </head>
 <body>
     <div class="register-container">
@@ -1639,7 +1379,121 @@ def register():
         });
     </script>
 </body>
-</html>''')
+</html>'''
+REGISTER_PAGE = build_static_page(REGISTER_HTML)
+REGISTER_MAX_BODY = 16 * 1024
+DUPLICATE_USER_MESSAGES = (
+    ('username', 'Username already exists. Please choose a different username.'),
+    ('email', 'Email already registered. Please use a different email.'),
+    ('pan_number', 'PAN number already registered. Please check your PAN number.'),
+)
+
+
+def duplicate_user_message(user):
+    # Only runs after an INSERT hit a UNIQUE index. SQLite reports just one of the
+    # violated constraints, so look up every clash and report them in field order
+    taken = db.session.execute(
+        db.select(User.username, User.email, User.pan_number)
+        .where(db.or_(User.username == user.username, User.email == user.email,
+                      User.pan_number == user.pan_number))
+    ).all()
+    for field, message in DUPLICATE_USER_MESSAGES:
+        if any(getattr(row, field) == getattr(user, field) for row in taken):
+            return message
+    return None
+
+
+@app.route('/register', methods=['GET', 'POST'])
+def register():
+    if request.method == 'POST':
+        # Registration bodies are a few hundred bytes; anything larger is refused with
+        # a 413 before it is read or parsed
+        request.max_content_length = REGISTER_MAX_BODY
+        # Parsed once and cached on the request; the page's fetch handler reads every
+        # reply as JSON, so body errors get the same JSON shape as the checks below
+        try:
+            data = request.get_json(cache=True)
+        except RequestEntityTooLarge:
+            return jsonify({'success': False, 'message': 'Registration data is too large.'}), 413
+        except UnsupportedMediaType:
+            return jsonify({'success': False, 'message': 'Registration data must be sent as JSON.'}), 415
+        except BadRequest:
+            return jsonify({'success': False, 'message': 'Registration data is not valid JSON.'}), 400
+        if not isinstance(data, dict):
+            return jsonify({'success': False, 'message': 'Invalid registration data.'}), 400
+
+        try:
+            # Validate required fields
+            required_fields = ['username', 'password', 'full_name', 'email', 'phone',
+                             'date_of_birth', 'gender', 'address', 'pan_number']
+
+            for field in required_fields:
+                if not data.get(field):
+                    return jsonify({'success': False, 'message': f'Missing required field: {field}'}), 400
+
+            # Validate PAN format
+            if not validate_pan(data['pan_number']):
+                return jsonify({'success': False, 'message': 'Invalid PAN number format. Please enter a valid PAN number.'}), 400
+
+            # Parse and validate date of birth
+            try:
+                birth_date = date.fromisoformat(data['date_of_birth'])
+            except ValueError:
+                return jsonify({'success': False, 'message': 'Invalid date format. Please enter a valid date of birth.'}), 400
+
+            # Calculate age and validate
+            calculated_age = calculate_age(birth_date)
+            if calculated_age < 18:
+                return jsonify({'success': False, 'message': 'You must be at least 18 years old to register.'}), 400
+            if calculated_age > 100:
+                return jsonify({'success': False, 'message': 'Please enter a valid date of birth.'}), 400
+
+            # Create new user
+            user = User(
+                digital_token=generate_token(),
+                username=data['username'].strip(),
+                password_hash=hash_password(data['password']),
+                full_name=data['full_name'].strip(),
+                email=data['email'].strip().lower(),
+                phone=data['phone'].strip(),
+                date_of_birth=birth_date,
+                gender=data['gender'].lower(),
+                address=data['address'].strip(),
+                pan_number=data['pan_number'].upper().strip(),
+                # Biometric data marked as verified (simulated)
+                face_data="verified",
+                retina_data="verified"
+            )
+
+            # Add user to database in a single INSERT; the UNIQUE indexes on username,
+            # email and PAN reject duplicates, so no existence checks run beforehand
+            db.session.add(user)
+            try:
+                db.session.commit()
+            except IntegrityError:
+                db.session.rollback()
+                message = duplicate_user_message(user)
+                if message is None:
+                    raise
+                return jsonify({'success': False, 'message': message}), 400
+
+            return jsonify({
+                'success': True,
+                'digital_token': user.digital_token,
+                'message': 'Registration successful! Please save your digital token securely.'
+            })
+
+        except Exception as e:
+            # Rollback in case of any error
+            db.session.rollback()
+            print(f"Registration error: {str(e)}")  # For debugging
+            return jsonify({
+                'success': False,
+                'message': f'Registration failed: {str(e)}'
+            }), 500
+
+    # GET request - return registration form
+    return static_page_response(REGISTER_PAGE)
 
 
 @app.route('/verify-proximity', methods=['POST'])
@@ -1653,28 +1507,9 @@ def verify_retina():
 
 
 # Additional routes for the complete platform
-@app.route('/schemes')
-def schemes():
-    if 'user_id' not in session:
-        return redirect('/login')
-
-    schemes = Scheme.query.filter_by(is_active=True).all()
-    return render_template_string('''<!DOCTYPE html>
+PAGE_TEMPLATES['schemes.html'] = '''<!DOCTYPE html>
 <html><head><title>Life Insurance Plans</title>
-<style>
-    body { font-family: 'Segoe UI', sans-serif; background: #f8f9fa; margin: 0; padding: 30px; }
-    .container { max-width: 1200px; margin: 0 auto; }
-    .header { text-align: center; margin-bottom: 50px; }
-    .header h1 { color: #2C3E50; font-size: 3em; margin-bottom: 15px; }
-    .schemes-grid { display: grid; grid-template-columns: repeat(auto-fit, minmax(350px, 1fr)); gap: 30px; }
-    .scheme-card { background: white; border-radius: 20px; padding: 40px; box-shadow: 0 10px 30px rgba(0,0,0,0.1); transition: transform 0.3s ease; }
-    .scheme-card:hover { transform: translateY(-10px); }
-    .scheme-name { color: #2C3E50; font-size: 1.8em; margin-bottom: 10px; }
-    .scheme-coverage { color: #8B4A9C; font-size: 2.2em; font-weight: bold; margin-bottom: 5px; }
-    .scheme-premium { color: #6c757d; font-size: 1.1em; }
-    .apply-btn { width: 100%; background: linear-gradient(45deg, #8B4A9C, #B366CC); color: white; padding: 15px; border: none; border-radius: 10px; font-size: 1.1em; font-weight: 600; text-decoration: none; display: inline-block; text-align: center; margin-top: 20px; }
-    .back-btn { background: #6c757d; color: white; padding: 12px 25px; border-radius: 25px; text-decoration: none; margin-bottom: 30px; }
-</style></head>
+<link rel="stylesheet" href="{{ asset_url('css/schemes.css') }}"></head>
 <body>
     <div class="container">
         <a href="/dashboard" class="back-btn">← Back to Dashboard</a>
@@ -1693,30 +1528,19 @@ def schemes():
             {% endfor %}
         </div>
     </div>
-</body></html>''', schemes=schemes)
+</body></html>'''
 
 
-@app.route('/apply-policy/<int:scheme_id>', methods=['GET', 'POST'])
-def apply_policy(scheme_id):
-    if 'user_id' not in session:
-        return redirect('/login')
+@app.route('/schemes')
+@login_required
+def schemes():
+    schemes = get_active_schemes()
+    return compressed_html_response(render_template('schemes.html', schemes=schemes))
 
-    scheme = Scheme.query.get_or_404(scheme_id)
-    user = User.query.get(session['user_id'])
 
-    if request.method == 'POST':
-        # Verify Digital Token
-        token_entered = request.form.get('digital_token', '').upper()
-        if user.digital_token != token_entered:
-            return render_template_string('''<!DOCTYPE html>
+PAGE_TEMPLATES['apply_token_failed.html'] = '''<!DOCTYPE html>
 <html><head><title>Token Verification Failed</title>
-<style>
-    body { font-family: 'Segoe UI', sans-serif; background: #f8f9fa; padding: 50px; text-align: center; }
-    .error-container { background: white; padding: 50px; border-radius: 20px; max-width: 600px; margin: 0 auto; box-shadow: 0 10px 30px rgba(0,0,0,0.1); }
-    .error-icon { font-size: 4em; color: #dc3545; margin-bottom: 20px; }
-    h1 { color: #2C3E50; margin-bottom: 20px; }
-    .btn { background: #8B4A9C; color: white; padding: 15px 30px; border: none; border-radius: 25px; text-decoration: none; display: inline-block; margin-top: 20px; }
-</style></head>
+<link rel="stylesheet" href="{{ asset_url('css/token_failed.css') }}"></head>
 <body>
     <div class="error-container">
         <div class="error-icon">❌</div>
@@ -1724,43 +1548,12 @@ def apply_policy(scheme_id):
         <p>Digital token does not match our records. Please enter the correct token.</p>
         <a href="/apply-policy/{{ scheme.id }}" class="btn">Try Again</a>
     </div>
-</body></html>''', scheme=scheme)
-
-        # Create policy
-        new_policy = Policy(
-            policy_number=generate_policy_number(),
-            user_id=user.id,
-            scheme_id=scheme.id,
-            premium_amount=scheme.premium_amount,
-            coverage_amount=scheme.coverage_amount,
-            start_date=date.today(),
-            end_date=date.today() + timedelta(days=365 * 10)
-        )
-        db.session.add(new_policy)
-        db.session.flush()
+</body></html>'''
 
-        # Add nominee
-        nominee = Nominee(
-            user_id=user.id,
-            policy_id=new_policy.id,
-            name=request.form['nominee_name'],
-            relationship=request.form['nominee_relationship']
-        )
-        db.session.add(nominee)
-        db.session.commit()
 
-        return render_template_string('''<!DOCTYPE html>
+PAGE_TEMPLATES['policy_applied.html'] = '''<!DOCTYPE html>
 <html><head><title>Application Successful</title>
-<style>
-    body { font-family: 'Segoe UI', sans-serif; background: #f8f9fa; padding: 50px; text-align: center; }
-    .success-container { background: white; padding: 60px; border-radius: 20px; max-width: 700px; margin: 0 auto; box-shadow: 0 20px 40px rgba(0,0,0,0.1); }
-    .success-icon { font-size: 5em; color: #28a745; margin-bottom: 30px; }
-    h1 { color: #2C3E50; margin-bottom: 20px; font-size: 2.5em; }
-    .policy-info { background: #f8f9fa; padding: 30px; border-radius: 15px; margin: 30px 0; }
-    .policy-number { font-size: 1.5em; font-weight: bold; color: #8B4A9C; margin: 15px 0; }
-    .btn { background: #8B4A9C; color: white; padding: 15px 30px; border: none; border-radius: 25px; text-decoration: none; display: inline-block; margin: 10px; font-weight: 600; }
-    .withdrawal-notice { background: #fff3cd; border: 1px solid #ffeaa7; padding: 20px; border-radius: 10px; margin: 20px 0; color: #856404; }
-</style></head>
+<link rel="stylesheet" href="{{ asset_url('css/policy_applied.css') }}"></head>
 <body>
     <div class="success-container">
         <div class="success-icon">🎉</div>
@@ -1784,34 +1577,42 @@ def apply_policy(scheme_id):
         <a href="/my-policies" class="btn">View My Policies</a>
         <a href="/dashboard" class="btn" style="background: #6c757d;">Back to Dashboard</a>
     </div>
-</body></html>''', policy=new_policy, nominee=nominee)
+</body></html>'''
+
+
+# Scheme-only part of the apply form; identical for every viewer, so it is rendered
+# once per scheme and reused (see scheme_plan_panel)
+PAGE_TEMPLATES['plan_panel.html'] = '''<div class="plan-details">
+    <h2>Life Insurance Plan Details</h2>
+    <div class="plan-summary">
+        <h3>{{ scheme.name }}</h3>
+        <div class="coverage-amount">₹{{ "{:,.0f}".format(scheme.coverage_amount) }}</div>
+        <div class="premium-amount">Monthly Premium: ₹{{ "{:,.0f}".format(scheme.premium_amount) }}</div>
+        <p style="margin-top: 15px; opacity: 0.9;">Pure Life Insurance Coverage</p>
+    </div>
+
+    <p><strong>Description:</strong> {{ scheme.description }}</p>
+
+    <h3>Life Insurance Benefits:</h3>
+    <ul class="features-list">
+        {% for feature in scheme.features or () %}
+        <li>{{ feature }}</li>
+        {% endfor %}
+    </ul>
 
-    return render_template_string('''<!DOCTYPE html>
+    <h3>Eligibility:</h3>
+    <ul class="features-list">
+        <li>Age: {{ scheme.min_age }} to {{ scheme.max_age }} years</li>
+        <li>Indian citizen with valid documents</li>
+        <li>Good health condition required</li>
+        <li>Life insurance medical examination may be required</li>
+    </ul>
+</div>'''
+
+
+PAGE_TEMPLATES['apply_policy.html'] = '''<!DOCTYPE html>
 <html><head><title>Apply for {{ scheme.name }}</title>
-<style>
-    body { font-family: 'Segoe UI', sans-serif; background: #f8f9fa; padding: 30px; }
-    .container { max-width: 1000px; margin: 0 auto; }
-    .application-form { background: white; padding: 50px; border-radius: 20px; box-shadow: 0 10px 30px rgba(0,0,0,0.1); margin-bottom: 30px; }
-    .plan-details { background: white; padding: 40px; border-radius: 20px; box-shadow: 0 10px 30px rgba(0,0,0,0.1); }
-    h1 { color: #2C3E50; margin-bottom: 30px; font-size: 2.5em; text-align: center; }
-    h2 { color: #2C3E50; margin-bottom: 25px; border-bottom: 2px solid #8B4A9C; padding-bottom: 10px; }
-    .form-grid { display: grid; grid-template-columns: 1fr 1fr; gap: 30px; margin-bottom: 30px; }
-    .form-group { margin-bottom: 20px; }
-    label { display: block; margin-bottom: 8px; font-weight: 600; color: #2C3E50; }
-    input, select { width: 100%; padding: 15px; border: 2px solid #e1e5e9; border-radius: 10px; font-size: 16px; box-sizing: border-box; }
-    input:focus, select:focus { outline: none; border-color: #8B4A9C; }
-    .readonly { background: #f8f9fa; }
-    .submit-btn { background: linear-gradient(45deg, #8B4A9C, #B366CC); color: white; padding: 18px 40px; border: none; border-radius: 10px; font-size: 1.2em; font-weight: 600; cursor: pointer; width: 100%; }
-    .back-btn { background: #6c757d; color: white; padding: 12px 25px; border-radius: 25px; text-decoration: none; display: inline-block; margin-bottom: 30px; }
-    .plan-summary { background: linear-gradient(45deg, #8B4A9C, #B366CC); color: white; padding: 30px; border-radius: 15px; margin-bottom: 30px; text-align: center; }
-    .coverage-amount { font-size: 2.5em; font-weight: bold; margin: 10px 0; }
-    .premium-amount { font-size: 1.3em; opacity: 0.9; }
-    .features-list { list-style: none; padding: 0; }
-    .features-list li { padding: 8px 0; color: #28a745; }
-    .features-list li:before { content: "✓ "; font-weight: bold; }
-    .warning-box { background: #fff3cd; border: 1px solid #ffeaa7; padding: 20px; border-radius: 10px; margin-bottom: 30px; }
-    .warning-box h3 { color: #856404; margin-bottom: 10px; }
-</style></head>
+<link rel="stylesheet" href="{{ asset_url('css/apply_policy.css') }}"></head>
 <body>
     <div class="container">
         <a href="/schemes" class="back-btn">← Back to Plans</a>
@@ -1873,66 +1674,56 @@ def apply_policy(scheme_id):
             </form>
         </div>
 
-        <div class="plan-details">
-            <h2>Life Insurance Plan Details</h2>
-            <div class="plan-summary">
-                <h3>{{ scheme.name }}</h3>
-                <div class="coverage-amount">₹{{ "{:,.0f}".format(scheme.coverage_amount) }}</div>
-                <div class="premium-amount">Monthly Premium: ₹{{ "{:,.0f}".format(scheme.premium_amount) }}</div>
-                <p style="margin-top: 15px; opacity: 0.9;">Pure Life Insurance Coverage</p>
-            </div>
+        {{ plan_panel }}
+    </div>
+</body></html>'''
 
-            <p><strong>Description:</strong> {{ scheme.description }}</p>
 
-            <h3>Life Insurance Benefits:</h3>
-            <ul class="features-list">
-                {% for feature in scheme.features|from_json %}
-                <li>{{ feature }}</li>
-                {% endfor %}
-            </ul>
-
-            <h3>Eligibility:</h3>
-            <ul class="features-list">
-                <li>Age: {{ scheme.min_age }} to {{ scheme.max_age }} years</li>
-                <li>Indian citizen with valid documents</li>
-                <li>Good health condition required</li>
-                <li>Life insurance medical examination may be required</li>
-            </ul>
-        </div>
-    </div>
-</body></html>''', scheme=scheme)
+@app.route('/apply-policy/<int:scheme_id>', methods=['GET', 'POST'])
+@login_required
+def apply_policy(scheme_id):
+    scheme = get_active_scheme(scheme_id)
+    if scheme is None:
+        abort(404)
 
+    if request.method == 'POST':
+        # Verify Digital Token
+        user_id = session['user_id']
+        token_entered = request.form.get('digital_token', '').upper()
+        if not verify_digital_token(user_id, token_entered):
+            return render_template('apply_token_failed.html', scheme=scheme)
 
-@app.route('/my-policies')
-def my_policies():
-    if 'user_id' not in session:
-        return redirect('/login')
+        # Create policy
+        new_policy = Policy(
+            policy_number=generate_policy_number(),
+            user_id=user_id,
+            scheme_id=scheme['id'],
+            premium_amount=scheme['premium_amount'],
+            coverage_amount=scheme['coverage_amount'],
+            start_date=date.today(),
+            end_date=date.today() + timedelta(days=365 * 10)
+        )
+
+        # Add nominee; attached through the relationship, so both rows go out in one
+        # flush with policy_id filled in from the new policy
+        nominee = Nominee(
+            user_id=user_id,
+            name=request.form['nominee_name'],
+            relationship=request.form['nominee_relationship']
+        )
+        new_policy.nominees.append(nominee)
+        db.session.add(new_policy)
+        db.session.commit()
+
+        return render_template('policy_applied.html', policy=new_policy, nominee=nominee)
 
-    policies = Policy.query.filter_by(user_id=session['user_id']).order_by(Policy.created_at.desc()).all()
+    return compressed_html_response(render_template('apply_policy.html', scheme=scheme,
+                                                    plan_panel=scheme_plan_panel(scheme)))
 
-    return render_template_string('''<!DOCTYPE html>
+
+PAGE_TEMPLATES['my_policies.html'] = '''<!DOCTYPE html>
     <html><head><title>My Policies</title>
-    <style>
-        body { font-family: 'Segoe UI', sans-serif; background: #f8f9fa; padding: 30px; }
-        .container { max-width: 1200px; margin: 0 auto; }
-        .header { background: white; padding: 30px; border-radius: 15px; margin-bottom: 30px; box-shadow: 0 5px 15px rgba(0,0,0,0.08); }
-        .policies-grid { display: grid; gap: 25px; }
-        .policy-card { background: white; padding: 35px; border-radius: 20px; box-shadow: 0 8px 25px rgba(0,0,0,0.1); }
-        .policy-header { display: flex; justify-content: space-between; align-items: center; margin-bottom: 25px; }
-        .policy-title { color: #2C3E50; font-size: 1.5em; margin: 0; }
-        .policy-number { color: #6c757d; font-size: 0.9em; }
-        .status-badge { padding: 8px 16px; border-radius: 20px; font-size: 0.85em; font-weight: 600; text-transform: uppercase; }
-        .status-applied { background: #fff3cd; color: #856404; }
-        .status-active { background: #d4edda; color: #155724; }
-        .status-withdrawn { background: #f8d7da; color: #721c24; }
-        .policy-details { display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 20px; margin-bottom: 25px; }
-        .detail-item { text-align: center; }
-        .detail-value { font-size: 1.3em; font-weight: bold; color: #8B4A9C; }
-        .detail-label { color: #6c757d; font-size: 0.9em; margin-top: 5px; }
-        .withdraw-btn { background: #dc3545; color: white; padding: 10px 20px; border: none; border-radius: 20px; font-size: 0.9em; cursor: pointer; }
-        .back-btn { background: #6c757d; color: white; padding: 12px 25px; border-radius: 25px; text-decoration: none; display: inline-block; margin-bottom: 30px; }
-        .empty-state { text-align: center; padding: 80px 20px; color: #6c757d; }
-    </style></head>
+    <link rel="stylesheet" href="{{ asset_url('css/my_policies.css') }}"></head>
     <body>
         <div class="container">
             <a href="/dashboard" class="back-btn">← Back to Dashboard</a>
@@ -1948,30 +1739,30 @@ def my_policies():
                 <div class="policy-card">
                     <div class="policy-header">
                         <div>
-                            <h3 class="policy-title">{{ policy.scheme.name }}</h3>
-                            <div class="policy-number">Policy #{{ policy.policy_number }}</div>
+                            <h3 class="policy-title">{{ policy.name }}</h3>
+                            <div class="policy-number">Policy #{{ policy.number }}</div>
                         </div>
-                        <span class="status-badge status-{{ policy.status }}">{{ policy.status|title }}</span>
+                        <span class="status-badge status-{{ policy.status }}">{{ policy.status_label }}</span>
                     </div>
 
                     <div class="policy-details">
                         <div class="detail-item">
-                            <div class="detail-value">₹{{ "{:,.0f}".format(policy.coverage_amount) }}</div>
+                            <div class="detail-value">{{ policy.coverage }}</div>
                             <div class="detail-label">Coverage Amount</div>
                         </div>
                         <div class="detail-item">
-                            <div class="detail-value">₹{{ "{:,.0f}".format(policy.premium_amount) }}</div>
+                            <div class="detail-value">{{ policy.premium }}</div>
                             <div class="detail-label">Monthly Premium</div>
                         </div>
                         <div class="detail-item">
-                            <div class="detail-value">{{ policy.created_at.strftime('%d %b %Y') }}</div>
+                            <div class="detail-value">{{ policy.applied }}</div>
                             <div class="detail-label">Applied On</div>
                         </div>
                     </div>
 
-                    {% if policy.is_withdrawable %}
+                    {% if policy.withdrawable %}
                     <div style="text-align: center; padding-top: 20px; border-top: 1px solid #e1e5e9;">
-                        <p style="color: #856404; margin-bottom: 15px;">⏰ Withdrawal available for {{ (86400 - (now - policy.created_at).total_seconds())|int // 3600 }} hours</p>
+                        <p style="color: #856404; margin-bottom: 15px;">⏰ Withdrawal available for {{ policy.hours_left }} hours</p>
                         <form method="POST" action="/withdraw-policy/{{ policy.id }}" style="display: inline;">
                             <button type="submit" class="withdraw-btn" onclick="return confirm('Are you sure you want to withdraw this policy application?')">Withdraw Application</button>
                         </form>
@@ -1989,43 +1780,53 @@ def my_policies():
             </div>
             {% endif %}
         </div>
-    </body></html>''', policies=policies)
+    </body></html>'''
+
+
+@app.route('/my-policies')
+@login_required
+def my_policies():
+    # Schemes come back in the same SELECT; the template reads policy.scheme.name per row
+    policies = (Policy.query.options(joinedload(Policy.scheme))
+                .filter_by(user_id=session['user_id']).order_by(Policy.created_at.desc()).all())
+
+    # Display strings built in one Python pass so the template loop only substitutes
+    now = datetime.utcnow()
+    rows = [{
+        'id': policy.id,
+        'name': policy.scheme.name,
+        'number': policy.policy_number,
+        'status': policy.status,
+        'status_label': policy.status.title(),
+        'coverage': f"₹{policy.coverage_amount:,.0f}",
+        'premium': f"₹{policy.premium_amount:,.0f}",
+        'applied': policy.created_at.strftime('%d %b %Y'),
+        'withdrawable': policy.is_withdrawable,
+        'hours_left': int(86400 - (now - policy.created_at).total_seconds()) // 3600,
+    } for policy in policies]
+
+    return compressed_html_response(render_template('my_policies.html', policies=rows))
 
 
 @app.route('/withdraw-policy/<int:policy_id>', methods=['POST'])
+@login_required
 def withdraw_policy(policy_id):
-    if 'user_id' not in session:
-        return redirect('/login')
-
-    policy = Policy.query.get_or_404(policy_id)
-    if policy.user_id == session['user_id'] and policy.is_withdrawable:
-        policy.status = 'withdrawn'
-        db.session.commit()
+    # Ownership and Policy.is_withdrawable checked by the UPDATE itself: one statement,
+    # and no window between the check and the write
+    db.session.execute(
+        db.update(Policy)
+        .where(Policy.id == policy_id, Policy.user_id == session['user_id'], Policy.status == 'applied',
+               Policy.created_at > datetime.utcnow() - timedelta(hours=24))
+        .values(status='withdrawn')
+    )
+    db.session.commit()
 
     return redirect('/my-policies')
 
 
-@app.route('/make-claim', methods=['GET', 'POST'])
-def make_claim():
-    if 'user_id' not in session:
-        return redirect('/login')
-
-    user = User.query.get(session['user_id'])
-    active_policies = Policy.query.filter_by(user_id=user.id, status='active').all()
-
-    if request.method == 'POST':
-        # Verify Digital Token
-        token_entered = request.form.get('digital_token', '').upper()
-        if user.digital_token != token_entered:
-            return render_template_string('''<!DOCTYPE html>
+CLAIM_TOKEN_FAILED_HTML = '''<!DOCTYPE html>
 <html><head><title>Token Verification Failed</title>
-<style>
-    body { font-family: 'Segoe UI', sans-serif; background: #f8f9fa; padding: 50px; text-align: center; }
-    .error-container { background: white; padding: 50px; border-radius: 20px; max-width: 600px; margin: 0 auto; box-shadow: 0 10px 30px rgba(0,0,0,0.1); }
-    .error-icon { font-size: 4em; color: #dc3545; margin-bottom: 20px; }
-    h1 { color: #2C3E50; margin-bottom: 20px; }
-    .btn { background: #8B4A9C; color: white; padding: 15px 30px; border: none; border-radius: 25px; text-decoration: none; display: inline-block; margin-top: 20px; }
-</style></head>
+<link rel="stylesheet" href="{{ asset_url('css/token_failed.css') }}"></head>
 <body>
     <div class="error-container">
         <div class="error-icon">❌</div>
@@ -2033,44 +1834,13 @@ def make_claim():
         <p>Digital token does not match our records. Please enter the correct token.</p>
         <a href="/make-claim" class="btn">Try Again</a>
     </div>
-</body></html>''')
-
-        # Handle file uploads
-        files = request.files.getlist('documents')
-        doc_paths = []
-
-        for file in files:
-            if file and file.filename:
-                filename = secure_filename(file.filename)
-                timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_')
-                filename = timestamp + filename
-                path = os.path.join('claim_documents', filename)
-                file.save(path)
-                doc_paths.append(path)
+</body></html>'''
+CLAIM_TOKEN_FAILED_PAGE = build_static_page(CLAIM_TOKEN_FAILED_HTML)
 
-        claim = Claim(
-            claim_number=generate_claim_number(),
-            user_id=user.id,
-            policy_id=request.form['policy_id'],
-            claim_amount=float(request.form['claim_amount']),
-            document_paths=json.dumps(doc_paths)
-        )
-        db.session.add(claim)
-        db.session.commit()
 
-        return render_template_string('''<!DOCTYPE html>
+PAGE_TEMPLATES['claim_submitted.html'] = '''<!DOCTYPE html>
 <html><head><title>Life Insurance Claim Submitted</title>
-<style>
-    body { font-family: 'Segoe UI', sans-serif; background: #f8f9fa; padding: 50px; text-align: center; }
-    .success-container { background: white; padding: 60px; border-radius: 20px; max-width: 700px; margin: 0 auto; box-shadow: 0 20px 40px rgba(0,0,0,0.1); }
-    .success-icon { font-size: 5em; color: #28a745; margin-bottom: 30px; }
-    h1 { color: #2C3E50; margin-bottom: 20px; font-size: 2.5em; }
-    .claim-info { background: #f8f9fa; padding: 30px; border-radius: 15px; margin: 30px 0; }
-    .claim-number { font-size: 1.5em; font-weight: bold; color: #8B4A9C; margin: 15px 0; }
-    .btn { background: #8B4A9C; color: white; padding: 15px 30px; border: none; border-radius: 25px; text-decoration: none; display: inline-block; margin: 10px; font-weight: 600; }
-    .processing-notice { background: #d4edda; border: 1px solid #c3e6cb; padding: 20px; border-radius: 10px; margin: 20px 0; color: #155724; }
-    .timeline { background: #e3f2fd; padding: 20px; border-radius: 10px; margin: 20px 0; color: #1976d2; }
-</style></head>
+<link rel="stylesheet" href="{{ asset_url('css/claim_submitted.css') }}"></head>
 <body>
     <div class="success-container">
         <div class="success-icon">✅</div>
@@ -2100,33 +1870,12 @@ def make_claim():
 
         <a href="/dashboard" class="btn">Back to Dashboard</a>
     </div>
-</body></html>''', claim=claim, doc_count=len(doc_paths))
+</body></html>'''
 
-    return render_template_string('''<!DOCTYPE html>
+
+PAGE_TEMPLATES['make_claim.html'] = '''<!DOCTYPE html>
 <html><head><title>File Life Insurance Claim</title>
-<style>
-    body { font-family: 'Segoe UI', sans-serif; background: #f8f9fa; padding: 30px; }
-    .container { max-width: 900px; margin: 0 auto; }
-    .claim-form { background: white; padding: 50px; border-radius: 20px; box-shadow: 0 10px 30px rgba(0,0,0,0.1); }
-    h1 { color: #2C3E50; margin-bottom: 30px; font-size: 2.5em; text-align: center; }
-    .form-section { margin-bottom: 40px; }
-    .form-section h2 { color: #2C3E50; margin-bottom: 20px; border-bottom: 2px solid #8B4A9C; padding-bottom: 10px; }
-    .form-grid { display: grid; grid-template-columns: 1fr 1fr; gap: 25px; }
-    .form-group { margin-bottom: 25px; }
-    label { display: block; margin-bottom: 8px; font-weight: 600; color: #2C3E50; }
-    input, select { width: 100%; padding: 15px; border: 2px solid #e1e5e9; border-radius: 10px; font-size: 16px; box-sizing: border-box; }
-    input:focus, select:focus { outline: none; border-color: #8B4A9C; }
-    .readonly { background: #f8f9fa; }
-    .file-upload { background: #f8f9fa; border: 2px dashed #8B4A9C; padding: 40px; text-align: center; border-radius: 15px; }
-    .submit-btn { background: linear-gradient(45deg, #8B4A9C, #B366CC); color: white; padding: 18px 40px; border: none; border-radius: 10px; font-size: 1.2em; font-weight: 600; cursor: pointer; width: 100%; }
-    .back-btn { background: #6c757d; color: white; padding: 12px 25px; border-radius: 25px; text-decoration: none; display: inline-block; margin-bottom: 30px; }
-    .no-policies { text-align: center; padding: 60px; color: #6c757d; }
-    .instructions { background: #e3f2fd; padding: 25px; border-radius: 15px; margin-bottom: 30px; }
-    .instructions h3 { color: #1976d2; margin-bottom: 15px; }
-    .instructions ul { list-style-type: none; padding: 0; }
-    .instructions li { padding: 5px 0; color: #1976d2; }
-    .instructions li:before { content: "📌 "; }
-</style></head>
+<link rel="stylesheet" href="{{ asset_url('css/make_claim.css') }}"></head>
 <body>
     <div class="container">
         <a href="/dashboard" class="back-btn">← Back to Dashboard</a>
@@ -2205,44 +1954,49 @@ def make_claim():
         </div>
         {% endif %}
     </div>
-</body></html>''', active_policies=active_policies)
-
+</body></html>'''
 
-@app.route('/profile', methods=['GET', 'POST'])
-def profile():
-    if 'user_id' not in session:
-        return redirect('/login')
 
-    user = User.query.get(session['user_id'])
+@app.route('/make-claim', methods=['GET', 'POST'])
+@login_required
+def make_claim():
+    user = get_current_user()
 
     if request.method == 'POST':
-        # Handle profile picture upload
-        if 'profile_picture' in request.files:
-            file = request.files['profile_picture']
+        # Verify Digital Token
+        token_entered = request.form.get('digital_token', '').upper()
+        if not digital_token_matches(user.digital_token, token_entered):
+            return fixed_page_response(CLAIM_TOKEN_FAILED_PAGE)
+
+        # Handle file uploads
+        files = request.files.getlist('documents')
+        doc_paths = []
+
+        for file in files:
             if file and file.filename:
-                filename = secure_filename(file.filename)
-                timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_')
-                filename = f"profile_{user.id}_{timestamp}{os.path.splitext(filename)[1]}"
+                path = os.path.join('claim_documents', upload_filename(file.filename))
+                save_upload(file, path)
+                doc_paths.append(path)
+
+        claim = Claim(
+            claim_number=generate_claim_number(),
+            user_id=user.id,
+            policy_id=request.form['policy_id'],
+            claim_amount=float(request.form['claim_amount']),
+            document_paths=json.dumps(doc_paths)
+        )
+        db.session.add(claim)
+        db.session.commit()
 
-                # Create profile_pictures folder if it doesn't exist
-                os.makedirs('profile_pictures', exist_ok=True)
+        return render_template('claim_submitted.html', claim=claim, doc_count=len(doc_paths))
 
-                file_path = os.path.join('profile_pictures', filename)
-                file.save(file_path)
+    active_policies = Policy.query.filter_by(user_id=user.id, status='active').all()
+    return render_template('make_claim.html', active_policies=active_policies)
 
-                # Update user profile picture path
-                user.profile_picture = file_path
-                db.session.commit()
 
-                return render_template_string('''<!DOCTYPE html>
+PROFILE_UPDATED_HTML = '''<!DOCTYPE html>
 <html><head><title>Profile Updated</title>
-<style>
-    body { font-family: 'Segoe UI', sans-serif; background: #f8f9fa; padding: 50px; text-align: center; }
-    .success-container { background: white; padding: 50px; border-radius: 20px; max-width: 600px; margin: 0 auto; box-shadow: 0 10px 30px rgba(0,0,0,0.1); }
-    .success-icon { font-size: 4em; color: #28a745; margin-bottom: 20px; }
-    h1 { color: #2C3E50; margin-bottom: 20px; }
-    .btn { background: #8B4A9C; color: white; padding: 15px 30px; border: none; border-radius: 25px; text-decoration: none; display: inline-block; margin-top: 20px; }
-</style></head>
+<link rel="stylesheet" href="{{ asset_url('css/success.css') }}"></head>
 <body>
     <div class="success-container">
         <div class="success-icon">✅</div>
@@ -2250,37 +2004,13 @@ def profile():
         <p>Your profile picture has been updated successfully.</p>
         <a href="/profile" class="btn">View Profile</a>
     </div>
-</body></html>''')
+</body></html>'''
+PROFILE_UPDATED_PAGE = build_static_page(PROFILE_UPDATED_HTML)
 
-    policies_count = Policy.query.filter_by(user_id=user.id).count()
-    claims_count = Claim.query.filter_by(user_id=user.id).count()
 
-    return render_template_string('''<!DOCTYPE html>
+PAGE_TEMPLATES['profile.html'] = '''<!DOCTYPE html>
 <html><head><title>My Profile</title>
-<style>
-    body { font-family: 'Segoe UI', sans-serif; background: #f8f9fa; padding: 30px; }
-    .container { max-width: 1000px; margin: 0 auto; }
-    .profile-header { background: linear-gradient(45deg, #8B4A9C, #B366CC); color: white; padding: 50px; border-radius: 20px; text-align: center; margin-bottom: 30px; position: relative; }
-    .profile-avatar { width: 120px; height: 120px; background: rgba(255,255,255,0.2); border-radius: 50%; display: flex; align-items: center; justify-content: center; font-size: 3em; margin: 0 auto 20px; overflow: hidden; border: 4px solid rgba(255,255,255,0.3); }
-    .profile-avatar img { width: 100%; height: 100%; object-fit: cover; }
-    .upload-btn { position: absolute; top: 20px; right: 20px; background: rgba(255,255,255,0.2); padding: 10px 20px; border-radius: 20px; text-decoration: none; color: white; font-weight: 600; }
-    .upload-btn:hover { background: rgba(255,255,255,0.3); }
-    .profile-grid { display: grid; grid-template-columns: 1fr 1fr; gap: 30px; }
-    .info-card { background: white; padding: 40px; border-radius: 20px; box-shadow: 0 8px 25px rgba(0,0,0,0.1); }
-    .info-card h2 { color: #2C3E50; margin-bottom: 25px; border-bottom: 2px solid #8B4A9C; padding-bottom: 10px; }
-    .info-item { display: flex; justify-content: space-between; align-items: center; padding: 15px 0; border-bottom: 1px solid #f1f3f4; }
-    .info-item:last-child { border-bottom: none; }
-    .info-label { font-weight: 600; color: #2C3E50; }
-    .info-value { color: #6c757d; }
-    .back-btn { background: #6c757d; color: white; padding: 12px 25px; border-radius: 25px; text-decoration: none; display: inline-block; margin-bottom: 30px; }
-    .digital-token { background: linear-gradient(45deg, #8B4A9C, #B366CC); -webkit-background-clip: text; -webkit-text-fill-color: transparent; font-weight: bold; font-size: 1.2em; }
-    .upload-modal { display: none; position: fixed; z-index: 1000; left: 0; top: 0; width: 100%; height: 100%; background-color: rgba(0,0,0,0.5); }
-    .modal-content { background-color: white; margin: 15% auto; padding: 30px; border-radius: 20px; width: 80%; max-width: 500px; text-align: center; }
-    .close { color: #aaa; float: right; font-size: 28px; font-weight: bold; cursor: pointer; }
-    .close:hover { color: black; }
-    .file-upload-area { border: 2px dashed #8B4A9C; padding: 40px; border-radius: 15px; margin: 20px 0; background: #f8f9fa; }
-    .upload-submit { background: #8B4A9C; color: white; padding: 15px 30px; border: none; border-radius: 10px; font-size: 16px; cursor: pointer; margin-top: 20px; }
-</style></head>
+<link rel="stylesheet" href="{{ asset_url('css/profile.css') }}"></head>
 <body>
     <div class="container">
         <a href="/dashboard" class="back-btn">← Back to Dashboard</a>
@@ -2401,61 +2131,45 @@ def profile():
             }
         }
     </script>
-</body></html>''', user=user, policies_count=policies_count, claims_count=claims_count)
+</body></html>'''
+
+
+@app.route('/profile', methods=['GET', 'POST'])
+@login_required
+def profile():
+    user = get_current_user()
+
+    if request.method == 'POST':
+        # Handle profile picture upload
+        if 'profile_picture' in request.files:
+            file = request.files['profile_picture']
+            if file and file.filename:
+                file_path = os.path.join('profile_pictures', upload_filename(file.filename))
+                save_upload(file, file_path)
+
+                # Update user profile picture path
+                user.profile_picture = file_path
+                db.session.commit()
+
+                return fixed_page_response(PROFILE_UPDATED_PAGE)
+
+    policies_count, claims_count = user.policies_count, user.claims_count
+
+    return compressed_html_response(render_template('profile.html', user=user, policies_count=policies_count,
+                                                    claims_count=claims_count))
 
 
 # Add this route to serve profile pictures
 @app.route('/profile_pictures/<filename>')
 def uploaded_file(filename):
-    return send_from_directory('profile_pictures', filename)
-
-@app.route('/report-transaction', methods=['GET', 'POST'])
-def report_transaction():
-    if 'user_id' not in session:
-        return redirect('/login')
-
-    if request.method == 'POST':
-        report = Report(
-            user_id=session['user_id'],
-            report_type='unauthorized_transaction',
-            description=request.form['description']
-        )
-        db.session.add(report)
-        db.session.commit()
+    # Each upload gets a new random name, so a picture can be cached for a day;
+    # revalidation after that is answered with a 304 from its ETag/Last-Modified
+    return send_from_directory('profile_pictures', filename, conditional=True, max_age=86400)
 
-        return render_template_string('''<!DOCTYPE html>
-    <html><head><title>Report Submitted</title>
-    <style>
-        body { font-family: 'Segoe UI', sans-serif; background: #f8f9fa; padding: 50px; text-align: center; }
-        .success-container { background: white; padding: 50px; border-radius: 20px; max-width: 600px; margin: 0 auto; box-shadow: 0 10px 30px rgba(0,0,0,0.1); }
-        .success-icon { font-size: 4em; color: #28a745; margin-bottom: 20px; }
-        h1 { color: #2C3E50; margin-bottom: 20px; }
-        .btn {background: #8B4A9C; color: white; padding: 15px 30px; border: none; border-radius: 25px; text-decoration: none; display: inline-block; margin-top: 20px; }
-</style></head>
-<body>
-    <div class="success-container">
-        <div class="success-icon">✅</div>
-        <h1>Report Submitted Successfully</h1>
-        <p>Your report has been received and will be investigated within 24 hours. We'll contact you if additional information is needed.</p>
-        <p><strong>Reference ID:</strong> REP{{ now.strftime('%Y%m%d%H%M') }}</p>
-        <a href="/dashboard" class="btn">Return to Dashboard</a>
-    </div>
-</body></html>''')
 
-    return render_template_string('''<!DOCTYPE html>
+PAGE_TEMPLATES['report_transaction.html'] = '''<!DOCTYPE html>
 <html><head><title>Report Unauthorized Transaction</title>
-<style>
-    body { font-family: 'Segoe UI', sans-serif; background: #f8f9fa; padding: 30px; }
-    .container { max-width: 800px; margin: 0 auto; background: white; padding: 50px; border-radius: 20px; box-shadow: 0 10px 30px rgba(0,0,0,0.1); }
-    h1 { color: #2C3E50; margin-bottom: 30px; }
-    .form-group { margin-bottom: 25px; }
-    label { display: block; margin-bottom: 8px; font-weight: 600; color: #2C3E50; }
-    textarea { width: 100%; padding: 15px; border: 2px solid #e1e5e9; border-radius: 10px; font-size: 16px; min-height: 150px; box-sizing: border-box; }
-    textarea:focus { outline: none; border-color: #8B4A9C; }
-    .btn { background: #8B4A9C; color: white; padding: 15px 30px; border: none; border-radius: 10px; font-size: 16px; cursor: pointer; }
-    .btn:hover { background: #7a3d8a; }
-    .back-btn { background: #6c757d; color: white; padding: 12px 25px; border: none; border-radius: 25px; text-decoration: none; display: inline-block; margin-right: 15px; }
-</style></head>
+<link rel="stylesheet" href="{{ asset_url('css/report_form.css') }}"></head>
 <body>
     <div class="container">
         <h1>🚨 Report Unauthorized Transaction</h1>
@@ -2483,56 +2197,45 @@ def report_transaction():
             </div>
         </form>
     </div>
-</body></html>''')
+</body></html>'''
 
 
-@app.route('/complaints-feedback', methods=['GET', 'POST'])
-def complaints_feedback():
-    if 'user_id' not in session:
-        return redirect('/login')
+REPORT_SUBMITTED_HTML = '''<!DOCTYPE html>
+    <html><head><title>Report Submitted</title>
+    <link rel="stylesheet" href="{{ asset_url('css/success.css') }}"></head>
+<body>
+    <div class="success-container">
+        <div class="success-icon">✅</div>
+        <h1>Report Submitted Successfully</h1>
+        <p>Your report has been received and will be investigated within 24 hours. We'll contact you if additional information is needed.</p>
+        <p><strong>Reference ID:</strong> REP{{ reference }}</p>
+        <a href="/dashboard" class="btn">Return to Dashboard</a>
+    </div>
+</body></html>'''
+REPORT_SUBMITTED_PAGE = build_reference_page(REPORT_SUBMITTED_HTML)
+
 
+@app.route('/report-transaction', methods=['GET', 'POST'])
+@login_required
+def report_transaction():
     if request.method == 'POST':
-        report = Report(
+        # A single INSERT with no ORM object behind it, committed before the
+        # confirmation is shown so an acknowledged report is never lost
+        db.session.execute(db.insert(Report).values(
             user_id=session['user_id'],
-            report_type='complaint_feedback',
+            report_type='unauthorized_transaction',
             description=request.form['description']
-        )
-        db.session.add(report)
+        ))
         db.session.commit()
 
-        return render_template_string('''<!DOCTYPE html>
-<html><head><title>Feedback Submitted</title>
-<style>
-    body { font-family: 'Segoe UI', sans-serif; background: #f8f9fa; padding: 50px; text-align: center; }
-    .success-container { background: white; padding: 50px; border-radius: 20px; max-width: 600px; margin: 0 auto; box-shadow: 0 10px 30px rgba(0,0,0,0.1); }
-    .success-icon { font-size: 4em; color: #28a745; margin-bottom: 20px; }
-    h1 { color: #2C3E50; margin-bottom: 20px; }
-    .btn { background: #8B4A9C; color: white; padding: 15px 30px; border: none; border-radius: 25px; text-decoration: none; display: inline-block; margin-top: 20px; }
-</style></head>
-<body>
-    <div class="success-container">
-        <div class="success-icon">✅</div>
-        <h1>Feedback Submitted Successfully</h1>
-        <p>Thank you for your feedback. We value your input and will review it carefully to improve our services.</p>
-        <p><strong>Reference ID:</strong> FB{{ now.strftime('%Y%m%d%H%M') }}</p>
-        <a href="/dashboard" class="btn">Return to Dashboard</a>
-    </div>
-</body></html>''')
+        return reference_page_response(REPORT_SUBMITTED_PAGE)
+
+    return render_template('report_transaction.html')
 
-    return render_template_string('''<!DOCTYPE html>
+
+PAGE_TEMPLATES['complaints_feedback.html'] = '''<!DOCTYPE html>
 <html><head><title>Complaints & Feedback</title>
-<style>
-    body { font-family: 'Segoe UI', sans-serif; background: #f8f9fa; padding: 30px; }
-    .container { max-width: 800px; margin: 0 auto; background: white; padding: 50px; border-radius: 20px; box-shadow: 0 10px 30px rgba(0,0,0,0.1); }
-    h1 { color: #2C3E50; margin-bottom: 30px; }
-    .form-group { margin-bottom: 25px; }
-    label { display: block; margin-bottom: 8px; font-weight: 600; color: #2C3E50; }
-    textarea { width: 100%; padding: 15px; border: 2px solid #e1e5e9; border-radius: 10px; font-size: 16px; min-height: 150px; box-sizing: border-box; }
-    textarea:focus { outline: none; border-color: #8B4A9C; }
-    .btn { background: #8B4A9C; color: white; padding: 15px 30px; border: none; border-radius: 10px; font-size: 16px; cursor: pointer; }
-    .btn:hover { background: #7a3d8a; }
-    .back-btn { background: #6c757d; color: white; padding: 12px 25px; border: none; border-radius: 25px; text-decoration: none; display: inline-block; margin-right: 15px; }
-</style></head>
+<link rel="stylesheet" href="{{ asset_url('css/report_form.css') }}"></head>
 <body>
     <div class="container">
         <h1>💬 Complaints & Feedback</h1>
@@ -2560,192 +2263,242 @@ def complaints_feedback():
             </div>
         </form>
     </div>
-</body></html>''')
+</body></html>'''
+
+
+FEEDBACK_SUBMITTED_HTML = '''<!DOCTYPE html>
+<html><head><title>Feedback Submitted</title>
+<link rel="stylesheet" href="{{ asset_url('css/success.css') }}"></head>
+<body>
+    <div class="success-container">
+        <div class="success-icon">✅</div>
+        <h1>Feedback Submitted Successfully</h1>
+        <p>Thank you for your feedback. We value your input and will review it carefully to improve our services.</p>
+        <p><strong>Reference ID:</strong> FB{{ reference }}</p>
+        <a href="/dashboard" class="btn">Return to Dashboard</a>
+    </div>
+</body></html>'''
+FEEDBACK_SUBMITTED_PAGE = build_reference_page(FEEDBACK_SUBMITTED_HTML)
+
+
+@app.route('/complaints-feedback', methods=['GET', 'POST'])
+@login_required
+def complaints_feedback():
+    if request.method == 'POST':
+        # Written the same way as report_transaction
+        db.session.execute(db.insert(Report).values(
+            user_id=session['user_id'],
+            report_type='complaint_feedback',
+            description=request.form['description']
+        ))
+        db.session.commit()
+
+        return reference_page_response(FEEDBACK_SUBMITTED_PAGE)
+
+    return render_template('complaints_feedback.html')
 
 
 # ===================================
 # APP INITIALIZATION AND RUN
 # ===================================
-if __name__ == '__main__':
-    with app.app_context():
-        # First, try to migrate existing database
-        try:
-            migrate_database()
-        except:
-            # If migration fails, recreate the database
-            print("🔄 Recreating database...")
-            db.drop_all()
-            db.create_all()
-
-        # Ensure all tables are created
+# Plans added to an empty database at startup
+SCHEME_SEED = (
+    dict(
+        name='Pure Life Term Insurance',
+        category='life',
+        description='Pure term life insurance providing maximum coverage at lowest premium. No maturity benefit, only death benefit.',
+        premium_amount=750,
+        coverage_amount=10000000,
+        features=[
+            'Death Benefit up to ₹1 Crore',
+            'Lowest Premium Rates',
+            'Tax Benefits under Section 80C',
+            'Online Policy Management',
+            'Quick Claim Settlement'
+        ]
+    ),
+    dict(
+        name='Whole Life Insurance Plan',
+        category='life',
+        description='Lifelong life insurance coverage with guaranteed death benefit and cash value accumulation.',
+        premium_amount=2000,
+        coverage_amount=1500000,
+        features=[
+            'Lifelong Coverage',
+            'Guaranteed Death Benefit',
+            'Cash Value Accumulation',
+            'Loan Against Policy',
+            'Tax Benefits on Premium'
+        ]
+    ),
+    dict(
+        name='Endowment Life Insurance',
+        category='life',
+        description='Life insurance with savings component providing maturity benefit if you survive the policy term.',
+        premium_amount=3000,
+        coverage_amount=2000000,
+        features=[
+            'Death Benefit + Maturity Benefit',
+            'Guaranteed Returns',
+            'Bonus Additions',
+            'Life Coverage Throughout',
+            'Wealth Creation'
+        ]
+    ),
+    dict(
+        name='Child Life Insurance Plan',
+        category='life',
+        description='Life insurance plan securing child\'s future with education benefits and life coverage.',
+        premium_amount=1500,
+        coverage_amount=2500000,
+        features=[
+            'Child\'s Life Coverage',
+            'Education Fund Creation',
+            'Waiver of Premium Benefit',
+            'Maturity at Important Ages',
+            'Parent Life Cover Option'
+        ]
+    ),
+    dict(
+        name='Unit Linked Life Insurance',
+        category='life',
+        description='Life insurance with investment in market-linked funds for wealth creation and life protection.',
+        premium_amount=2500,
+        coverage_amount=3000000,
+        features=[
+            'Life Cover + Investment',
+            'Market-Linked Returns',
+            'Fund Switching Option',
+            'Partial Withdrawal',
+            'Flexible Premium Payment'
+        ]
+    ),
+    dict(
+        name='Money Back Life Insurance',
+        category='life',
+        description='Life insurance with periodic money back benefits during policy term plus death benefit.',
+        premium_amount=1800,
+        coverage_amount=2000000,
+        features=[
+            'Periodic Money Back',
+            'Life Coverage Throughout',
+            'Maturity Benefit',
+            'Loyalty Additions',
+            'Premium Payment Flexibility'
+        ]
+    ),
+    dict(
+        name='Group Life Insurance',
+        category='life',
+        description='Life insurance for group of people like employees with affordable premium rates.',
+        premium_amount=500,
+        coverage_amount=1000000,
+        features=[
+            'Group Life Coverage',
+            'Low Premium Rates',
+            'Easy Enrollment',
+            'Employer Contribution',
+            'Conversion Option'
+        ]
+    ),
+    dict(
+        name='Pension Life Insurance',
+        category='life',
+        description='Life insurance with pension benefits providing regular income after retirement with life cover.',
+        premium_amount=3500,
+        coverage_amount=1500000,
+        features=[
+            'Retirement Income',
+            'Life Cover During Accumulation',
+            'Guaranteed Pension',
+            'Spouse Pension Option',
+            'Return of Purchase Price'
+        ]
+    ),
+    dict(
+        name='Women Life Insurance Plan',
+        category='life',
+        description='Specially designed life insurance for women with additional benefits and lower premium rates.',
+        premium_amount=800,
+        coverage_amount=1800000,
+        features=[
+            'Women-Specific Life Cover',
+            'Maternity Benefits',
+            'Lower Premium for Women',
+            'Critical Illness Rider',
+            'Flexible Payment Terms'
+        ]
+    ),
+    dict(
+        name='Senior Citizen Life Insurance',
+        category='life',
+        description='Life insurance tailored for senior citizens aged 50-80 with simplified underwriting.',
+        premium_amount=1200,
+        coverage_amount=800000,
+        min_age=50,
+        max_age=80,
+        features=[
+            'Senior Citizen Life Cover',
+            'No Medical Examination',
+            'Immediate Coverage',
+            'Guaranteed Acceptance',
+            'Final Expense Coverage'
+        ]
+    )
+)
+
+
+def init_database():
+    """Create missing tables, migrate older databases and seed the schemes. Needs an app context."""
+    # Create any missing tables, then bring older databases up to date.
+    # Migration errors propagate instead of wiping user data.
+    # One read of the table list decides whether create_all() has anything to do.
+    if not set(db.metadata.tables) <= set(db.inspect(db.engine).get_table_names()):
         db.create_all()
+    migrate_database()
+
+    # Add comprehensive life insurance schemes
+    if db.session.execute(db.select(Scheme.id).limit(1)).first() is None:
+        # Plain dicts go through the bulk INSERT path: one multi-row statement
+        db.session.execute(db.insert(Scheme), SCHEME_SEED)
+        db.session.commit()
+        clear_scheme_cache()
+        print("--- Database seeded with comprehensive life insurance schemes ---")
+        print("--- Available insurance plans: 10 ---")
+
 
-        # Add comprehensive life insurance schemes
-        if not Scheme.query.first():
-            schemes = [
-                Scheme(
-                    name='Pure Life Term Insurance',
-                    category='life',
-                    description='Pure term life insurance providing maximum coverage at lowest premium. No maturity benefit, only death benefit.',
-                    premium_amount=750,
-                    coverage_amount=10000000,
-                    features=json.dumps([
-                        'Death Benefit up to ₹1 Crore',
-                        'Lowest Premium Rates',
-                        'Tax Benefits under Section 80C',
-                        'Online Policy Management',
-                        'Quick Claim Settlement'
-                    ])
-                ),
-                Scheme(
-                    name='Whole Life Insurance Plan',
-                    category='life',
-                    description='Lifelong life insurance coverage with guaranteed death benefit and cash value accumulation.',
-                    premium_amount=2000,
-                    coverage_amount=1500000,
-                    features=json.dumps([
-                        'Lifelong Coverage',
-                        'Guaranteed Death Benefit',
-                        'Cash Value Accumulation',
-                        'Loan Against Policy',
-                        'Tax Benefits on Premium'
-                    ])
-                ),
-                Scheme(
-                    name='Endowment Life Insurance',
-                    category='life',
-                    description='Life insurance with savings component providing maturity benefit if you survive the policy term.',
-                    premium_amount=3000,
-                    coverage_amount=2000000,
-                    features=json.dumps([
-                        'Death Benefit + Maturity Benefit',
-                        'Guaranteed Returns',
-                        'Bonus Additions',
-                        'Life Coverage Throughout',
-                        'Wealth Creation'
-                    ])
-                ),
-                Scheme(
-                    name='Child Life Insurance Plan',
-                    category='life',
-                    description='Life insurance plan securing child\'s future with education benefits and life coverage.',
-                    premium_amount=1500,
-                    coverage_amount=2500000,
-                    features=json.dumps([
-                        'Child\'s Life Coverage',
-                        'Education Fund Creation',
-                        'Waiver of Premium Benefit',
-                        'Maturity at Important Ages',
-                        'Parent Life Cover Option'
-                    ])
-                ),
-                Scheme(
-                    name='Unit Linked Life Insurance',
-                    category='life',
-                    description='Life insurance with investment in market-linked funds for wealth creation and life protection.',
-                    premium_amount=2500,
-                    coverage_amount=3000000,
-                    features=json.dumps([
-                        'Life Cover + Investment',
-                        'Market-Linked Returns',
-                        'Fund Switching Option',
-                        'Partial Withdrawal',
-                        'Flexible Premium Payment'
-                    ])
-                ),
-                Scheme(
-                    name='Money Back Life Insurance',
-                    category='life',
-                    description='Life insurance with periodic money back benefits during policy term plus death benefit.',
-                    premium_amount=1800,
-                    coverage_amount=2000000,
-                    features=json.dumps([
-                        'Periodic Money Back',
-                        'Life Coverage Throughout',
-                        'Maturity Benefit',
-                        'Loyalty Additions',
-                        'Premium Payment Flexibility'
-                    ])
-                ),
-                Scheme(
-                    name='Group Life Insurance',
-                    category='life',
-                    description='Life insurance for group of people like employees with affordable premium rates.',
-                    premium_amount=500,
-                    coverage_amount=1000000,
-                    features=json.dumps([
-                        'Group Life Coverage',
-                        'Low Premium Rates',
-                        'Easy Enrollment',
-                        'Employer Contribution',
-                        'Conversion Option'
-                    ])
-                ),
-                Scheme(
-                    name='Pension Life Insurance',
-                    category='life',
-                    description='Life insurance with pension benefits providing regular income after retirement with life cover.',
-                    premium_amount=3500,
-                    coverage_amount=1500000,
-                    features=json.dumps([
-                        'Retirement Income',
-                        'Life Cover During Accumulation',
-                        'Guaranteed Pension',
-                        'Spouse Pension Option',
-                        'Return of Purchase Price'
-                    ])
-                ),
-                Scheme(
-                    name='Women Life Insurance Plan',
-                    category='life',
-                    description='Specially designed life insurance for women with additional benefits and lower premium rates.',
-                    premium_amount=800,
-                    coverage_amount=1800000,
-                    features=json.dumps([
-                        'Women-Specific Life Cover',
-                        'Maternity Benefits',
-                        'Lower Premium for Women',
-                        'Critical Illness Rider',
-                        'Flexible Payment Terms'
-                    ])
-                ),
-                Scheme(
-                    name='Senior Citizen Life Insurance',
-                    category='life',
-                    description='Life insurance tailored for senior citizens aged 50-80 with simplified underwriting.',
-                    premium_amount=1200,
-                    coverage_amount=800000,
-                    min_age=50,
-                    max_age=80,
-                    features=json.dumps([
-                        'Senior Citizen Life Cover',
-                        'No Medical Examination',
-                        'Immediate Coverage',
-                        'Guaranteed Acceptance',
-                        'Final Expense Coverage'
-                    ])
-                )
-            ]
-
-            db.session.bulk_save_objects(schemes)
-            db.session.commit()
-            print("--- Database seeded with comprehensive life insurance schemes ---")
-            print("--- Available insurance plans: 10 ---")
-
-    print("🚀 SecureBank Insurance Platform Starting...")
-    print("📊 Features Available:")
-    print("   ✅ User Registration with Biometric Verification")
-    print("   ✅ Secure Login System")
-    print("   ✅ 10+ Life Insurance Plans")
-    print("   ✅ Policy Application with PAN Verification")
-    print("   ✅ 24-Hour Policy Withdrawal")
-    print("   ✅ Claims Processing with Document Upload")
-    print("   ✅ Report Unauthorized Transactions")
-    print("   ✅ Complaints & Feedback System")
-    print("   ✅ Complete User Profile Management")
-    print("   ✅ FAQ Section with Life Insurance Information")
-    print("   ✅ Professional Banking-Style UI")
-    print("\n🌐 Access the platform at: http://localhost:5000")
-    print("🔐 All systems operational!")
-
-    app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
+@app.cli.command('init-db')
+def init_db_command():
+    """Create, migrate and seed the database; run before serving under a WSGI server."""
+    init_database()
+
+
+if __name__ == '__main__':
+    with app.app_context():
+        init_database()
+
+    # One write for the whole banner rather than a flush per line
+    print('\n'.join([
+        "🚀 SecureBank Insurance Platform Starting...",
+        "📊 Features Available:",
+        "   ✅ User Registration with Biometric Verification",
+        "   ✅ Secure Login System",
+        "   ✅ 10+ Life Insurance Plans",
+        "   ✅ Policy Application with PAN Verification",
+        "   ✅ 24-Hour Policy Withdrawal",
+        "   ✅ Claims Processing with Document Upload",
+        "   ✅ Report Unauthorized Transactions",
+        "   ✅ Complaints & Feedback System",
+        "   ✅ Complete User Profile Management",
+        "   ✅ FAQ Section with Life Insurance Information",
+        "   ✅ Professional Banking-Style UI",
+        "\n🌐 Access the platform at: http://localhost:5000",
+        "🔐 All systems operational!",
+    ]), flush=True)
+
+    # Development server; the reloader and debugger only with FLASK_DEBUG=1. In
+    # production run the app under a WSGI server instead, with no more threads per
+    # worker than its connection pool holds, e.g. gunicorn -w 4 -k gthread --threads 8 app3:app.
+    # A WSGI server never runs this block, so create and migrate the database first with
+    # flask --app app3 init-db (again after every upgrade); older databases need it to log in
+    app.run(debug=os.environ.get('FLASK_DEBUG') == '1', host='0.0.0.0', port=5000)
\ No newline at end of file